@@ -5,6 +5,7 @@ All language-specific parsers inherit from this class.
 
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Optional, Tuple
+from operator import attrgetter
 import logging
 
 from core.models import Song, Verse, VerseLine, Comment, PDFTextElement, ClassifiedText, ParsedDocument
@@ -75,6 +76,12 @@ class BaseParser(ABC):
             self.logger.debug("Step 6: Applying language customizations")
             customized_verses = self.apply_customizations(verses, chord_positioned_document)
             
+            # Customizations may add chords, so settle chord order once here;
+            # the exporters use line.chords in this order
+            for verse in customized_verses:
+                for line in verse.lines:
+                    line.chords.sort(key=attrgetter('position'))
+            
             # 7. Create song object
             self.logger.debug("Step 7: Creating song object")
             song = Song(
@@ -6,7 +6,10 @@ relative to lyrics using language-specific chord patterns.
 """
 
 import re
+import bisect
 import logging
+from collections import Counter
+from functools import lru_cache
 from typing import List, Dict, Set, Tuple, Optional
 from dataclasses import dataclass
 
@@ -36,8 +39,20 @@ class ChordDetector:
         self.logger = logging.getLogger(__name__)
         
         # Build chord detection patterns
-        self.chord_patterns = self._build_chord_patterns()
-        self.valid_chords = set(self.config.valid_chords)
+        self.chord_pattern = self._build_chord_pattern()
+        self.bracket_patterns = [
+            re.compile(r'\[([^\]]+)\]'),  # [chord]
+            re.compile(r'\(([^)]+)\)'),   # (chord)
+        ]
+        self.valid_chords = frozenset(self.config.valid_chords)
+        self.chord_normalization_rules = list(
+            self.config.get_custom_processing_rules().get('chord_normalization', {}).items()
+        )
+        
+        # Chord tokens repeat heavily across a document, so memoize the
+        # per-token helpers on this instance (rules and chords are per-config)
+        self._normalize_chord = lru_cache(maxsize=2048)(self._normalize_chord)
+        self._is_valid_chord = lru_cache(maxsize=2048)(self._is_valid_chord)
         
         # Positioning parameters
         self.chord_line_tolerance = 15.0  # pixels - how close chords must be to lyrics
@@ -45,33 +60,30 @@ class ChordDetector:
         
         self.logger.debug(f"Initialized chord detector with {len(self.valid_chords)} valid chords")
     
-    def _build_chord_patterns(self) -> List[re.Pattern]:
-        """Build regex patterns for chord detection based on language config"""
-        patterns = []
-        
+    def _build_chord_pattern(self) -> re.Pattern:
+        """Build a single alternation regex for chord detection based on language config"""
         # Basic chord pattern: letter + optional modifiers + optional numbers
         chord_letters = '|'.join(re.escape(letter) for letter in self.config.chord_letters)
         chord_modifiers = '|'.join(re.escape(mod) for mod in self.config.chord_modifiers)
         chord_numbers = '|'.join(self.config.chord_numbers)
         
-        # Main chord pattern
+        # Main chord pattern (case-insensitive)
         chord_pattern = (
             f'({chord_letters})'  # Base chord letter
             f'({chord_modifiers})?'  # Optional modifier
             f'({chord_numbers})?'  # Optional number
         )
         
-        patterns.append(re.compile(chord_pattern, re.IGNORECASE))
-        
-        # Special patterns for common chord variations
-        patterns.extend([
-            re.compile(r'\b([A-H][#b]?(?:sus[24]?|dim|aug|maj|min|add)?[0-9]*)\b'),
-            re.compile(r'\b([a-h][#b]?(?:sus[24]?|dim|aug|maj|min|add)?[0-9]*)\b'),
-            re.compile(r'\*'),  # Special symbol for certain songs
-            re.compile(r'd\*'),  # Special d* chord
-        ])
+        alternatives = [
+            f'(?i:{chord_pattern})',
+            # Special patterns for common chord variations
+            r'\b([A-H][#b]?(?:sus[24]?|dim|aug|maj|min|add)?[0-9]*)\b',
+            r'\b([a-h][#b]?(?:sus[24]?|dim|aug|maj|min|add)?[0-9]*)\b',
+            r'\*',  # Special symbol for certain songs
+            r'd\*',  # Special d* chord
+        ]
         
-        return patterns
+        return re.compile('|'.join(f'(?:{alt})' for alt in alternatives))
     
     def detect_and_position(self, document: ParsedDocument) -> ParsedDocument:
         """
@@ -85,11 +97,14 @@ class ChordDetector:
         """
         self.logger.info("Detecting and positioning chords")
         
-        # Separate chord elements from text elements
-        chord_elements = [elem for elem in document.text_elements 
-                         if elem.text_type == TextType.CHORD_LINE]
-        text_elements = [elem for elem in document.text_elements 
-                        if elem.text_type == TextType.VERSE_TEXT]
+        # Separate chord elements from text elements in a single pass
+        chord_elements = []
+        text_elements = []
+        for elem in document.text_elements:
+            if elem.text_type == TextType.CHORD_LINE:
+                chord_elements.append(elem)
+            elif elem.text_type == TextType.VERSE_TEXT:
+                text_elements.append(elem)
         
         self.logger.debug(f"Found {len(chord_elements)} chord elements and {len(text_elements)} text elements")
         
@@ -132,24 +147,21 @@ class ChordDetector:
         if not text:
             return chords
         
-        # Try each chord pattern
-        for pattern in self.chord_patterns:
-            matches = pattern.finditer(text)
+        # Single pass over the text with the combined chord pattern
+        for match in self.chord_pattern.finditer(text):
+            chord_text = match.group().strip()
             
-            for match in matches:
-                chord_text = match.group().strip()
+            # Validate chord
+            if self._is_valid_chord(chord_text):
+                normalized = self._normalize_chord(chord_text)
                 
-                # Validate chord
-                if self._is_valid_chord(chord_text):
-                    normalized = self._normalize_chord(chord_text)
-                    
-                    chord_match = ChordMatch(
-                        chord=chord_text,
-                        element=element,
-                        confidence=self._calculate_chord_confidence(chord_text, element),
-                        normalized_chord=normalized
-                    )
-                    chords.append(chord_match)
+                chord_match = ChordMatch(
+                    chord=chord_text,
+                    element=element,
+                    confidence=self._calculate_chord_confidence(chord_text, element),
+                    normalized_chord=normalized
+                )
+                chords.append(chord_match)
         
         return chords
     
@@ -159,12 +171,7 @@ class ChordDetector:
         text = element.text
         
         # Look for chord patterns within brackets or parentheses
-        bracket_patterns = [
-            re.compile(r'\[([^\]]+)\]'),  # [chord]
-            re.compile(r'\(([^)]+)\)'),   # (chord)
-        ]
-        
-        for pattern in bracket_patterns:
+        for pattern in self.bracket_patterns:
             matches = pattern.finditer(text)
             
             for match in matches:
@@ -186,6 +193,11 @@ class ChordDetector:
         if not chord_text:
             return False
         
+        # Fast path: already a clean, valid chord. Only for text without
+        # spaces, since spaced entries like "La m" must not match unstripped.
+        if ' ' not in chord_text and chord_text in self.valid_chords:
+            return True
+        
         # Clean up the chord text
         cleaned = chord_text.strip().replace(' ', '')
         
@@ -206,9 +218,7 @@ class ChordDetector:
         normalized = chord.replace(' ', '')
         
         # Apply language-specific normalization rules
-        normalization_rules = self.config.get_custom_processing_rules().get('chord_normalization', {})
-        
-        for old, new in normalization_rules.items():
+        for old, new in self.chord_normalization_rules:
             normalized = normalized.replace(old, new)
         
         return normalized
@@ -246,17 +256,18 @@ class ChordDetector:
         
         # Group text elements by line
         text_lines = self._group_text_by_line(text_elements)
+        sorted_text_ys = sorted(text_lines.keys())
         
         # Match chord lines to text lines
         for chord_line_y, chords_in_line in chord_lines.items():
             # Find the closest text line below this chord line
-            closest_text_line = self._find_closest_text_line(chord_line_y, text_lines)
+            closest_text_line = self._find_closest_text_line(chord_line_y, text_lines, sorted_text_ys)
             
             if closest_text_line:
-                # Position each chord in the line
-                for chord_match in chords_in_line:
-                    position = self._calculate_chord_position(chord_match, closest_text_line)
-                    
+                # Position all chords of the line in one batch
+                positions = self._calculate_chord_positions(chords_in_line, closest_text_line)
+                
+                for chord_match, position in zip(chords_in_line, positions):
                     positioned_chord = Chord(
                         chord=chord_match.normalized_chord,
                         position=position,
@@ -268,114 +279,108 @@ class ChordDetector:
     
     def _group_chords_by_line(self, chord_matches: List[ChordMatch]) -> Dict[float, List[ChordMatch]]:
         """Group chord matches by their vertical position (line)"""
-        lines = {}
-        
-        for chord_match in chord_matches:
-            y = chord_match.element.y
-            
-            # Find existing line within tolerance
-            found_line = None
-            for line_y in lines.keys():
-                if abs(y - line_y) <= self.chord_line_tolerance:
-                    found_line = line_y
-                    break
-            
-            if found_line is not None:
-                lines[found_line].append(chord_match)
-            else:
-                lines[y] = [chord_match]
-        
-        return lines
+        return self._group_by_line(chord_matches)
     
     def _group_text_by_line(self, text_elements: List[ClassifiedText]) -> Dict[float, List[ClassifiedText]]:
         """Group text elements by their vertical position (line)"""
+        return self._group_by_line(text_elements)
+    
+    def _group_by_line(self, items: list) -> Dict[float, list]:
+        """
+        Group items with an ``element.y`` into lines using a sorted sweep.
+        
+        Each line is keyed by the y of its first (topmost) item; an item joins the
+        current line while it is within chord_line_tolerance of that key.
+        """
         lines = {}
+        current_y = None
+        current_line = None
         
-        for text_elem in text_elements:
-            y = text_elem.element.y
-            
-            # Find existing line within tolerance
-            found_line = None
-            for line_y in lines.keys():
-                if abs(y - line_y) <= self.chord_line_tolerance:
-                    found_line = line_y
-                    break
+        for item in sorted(items, key=lambda i: i.element.y):
+            y = item.element.y
             
-            if found_line is not None:
-                lines[found_line].append(text_elem)
+            if current_line is not None and y - current_y <= self.chord_line_tolerance:
+                current_line.append(item)
             else:
-                lines[y] = [text_elem]
+                current_y = y
+                current_line = [item]
+                lines[y] = current_line
         
         return lines
     
-    def _find_closest_text_line(self, chord_y: float, text_lines: Dict[float, List[ClassifiedText]]) -> Optional[List[ClassifiedText]]:
+    def _find_closest_text_line(self, chord_y: float, text_lines: Dict[float, List[ClassifiedText]],
+                                sorted_text_ys: List[float]) -> Optional[List[ClassifiedText]]:
         """Find the text line closest to a chord line"""
-        if not text_lines:
-            return None
+        # Chords should be above text, so take the first text line below the chord line
+        index = bisect.bisect_right(sorted_text_ys, chord_y)
         
-        closest_y = None
-        min_distance = float('inf')
-        
-        for text_y in text_lines.keys():
-            # Chords should be above text, so look for text lines below chord line
-            if text_y > chord_y:
-                distance = text_y - chord_y
-                if distance < min_distance:
-                    min_distance = distance
-                    closest_y = text_y
-        
-        return text_lines.get(closest_y) if closest_y is not None else None
+        if index < len(sorted_text_ys):
+            return text_lines[sorted_text_ys[index]]
+        return None
     
-    def _calculate_chord_position(self, chord_match: ChordMatch, text_line: List[ClassifiedText]) -> int:
-        """Calculate the character position of a chord within a text line"""
+    def _calculate_chord_positions(self, chord_matches: List[ChordMatch],
+                                   text_line: List[ClassifiedText]) -> List[int]:
+        """Calculate the character positions of a line of chords within a text line"""
         if not text_line:
-            return 0
-        
-        chord_x = chord_match.element.x
+            return [0] * len(chord_matches)
         
-        # Find the text element that contains this x position
+        # Read each text element's geometry once for the whole chord line:
+        # (left x, right x, character width, text length)
+        geometry = []
         for text_elem in text_line:
             elem = text_elem.element
-            
-            # Check if chord is within this text element's horizontal bounds
-            if elem.x <= chord_x <= elem.x + elem.width:
-                # Calculate relative position within the text
-                relative_x = chord_x - elem.x
-                char_width = elem.width / len(elem.text) if elem.text else 1
-                position = int(relative_x / char_width)
-                
-                # Ensure position is within text bounds
-                return min(position, len(elem.text))
+            text_len = len(elem.text)
+            char_width = elem.width / text_len if text_len else 1
+            geometry.append((elem.x, elem.x + elem.width, char_width, text_len))
         
-        # If no exact match, find the closest text element
-        closest_elem = min(text_line, key=lambda te: abs(te.element.x - chord_x))
+        positions = []
+        for chord_match in chord_matches:
+            chord_x = chord_match.element.x
+            position = None
+            
+            # Find the text element that contains this x position
+            for left, right, char_width, text_len in geometry:
+                if left <= chord_x <= right:
+                    # Relative position within the text, kept within text bounds
+                    position = min(int((chord_x - left) / char_width), text_len)
+                    break
+            
+            if position is None:
+                # No exact match: position at start or end of the closest text element
+                left, _, _, text_len = min(geometry, key=lambda g: abs(g[0] - chord_x))
+                position = 0 if chord_x < left else text_len
+            
+            positions.append(position)
         
-        # Position at start or end based on relative position
-        if chord_x < closest_elem.element.x:
-            return 0
-        else:
-            return len(closest_elem.element.text)
+        return positions
     
     def get_detection_stats(self, chord_matches: List[ChordMatch]) -> Dict[str, any]:
         """Get statistics about chord detection"""
         if not chord_matches:
             return {'total_chords': 0}
         
-        chord_types = {}
-        confidence_scores = []
+        chord_types = Counter(match.normalized_chord for match in chord_matches)
+        
+        # Confidence min/max/sum in a single pass
+        min_confidence = float('inf')
+        max_confidence = float('-inf')
+        total_confidence = 0.0
         
         for match in chord_matches:
-            # Count chord types
-            chord_types[match.normalized_chord] = chord_types.get(match.normalized_chord, 0) + 1
-            confidence_scores.append(match.confidence)
+            confidence = match.confidence
+            total_confidence += confidence
+            if confidence < min_confidence:
+                min_confidence = confidence
+            if confidence > max_confidence:
+                max_confidence = confidence
         
         return {
             'total_chords': len(chord_matches),
             'unique_chords': len(chord_types),
             'chord_distribution': chord_types,
             'confidence': {
-                'min': min(confidence_scores) if confidence_scores else 0,
-                'max': max(confidence_scores) if confidence_scores else 0,
-                'avg': sum(confidence_scores) / len(confidence_scores) if confidence_scores else 0
+                'min': min_confidence,
+                'max': max_confidence,
+                'avg': total_confidence / len(chord_matches)
             }
         }
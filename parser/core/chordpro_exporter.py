@@ -5,7 +5,12 @@ This module converts Song objects to ChordPro format with proper chord
 positioning and language-specific formatting.
 """
 
+import os
+import re
 import logging
+from collections import Counter
+from functools import lru_cache
+from itertools import groupby
 from typing import List, Dict, Optional
 from datetime import datetime
 
@@ -13,6 +18,14 @@ from core.models import Song, Verse, VerseLine, Comment, Chord
 from languages.base_language import LanguageConfig
 
 
+# Whitespace other than newlines, at the start/end of a line and in runs
+_LINE_EDGE_WHITESPACE_RE = re.compile(r'^[^\S\n]+|[^\S\n]+$', re.MULTILINE)
+_WHITESPACE_RUN_RE = re.compile(r'[^\S\n]+')
+
+# A line starting (after whitespace) with the {title:} directive
+_TITLE_DIRECTIVE_RE = re.compile(r'^\s*\{title:', re.MULTILINE)
+
+
 class ChordProExporter:
     """
     Exports Song objects to ChordPro format.
@@ -35,6 +48,16 @@ class ChordProExporter:
         self.chord_bracket_style = self.export_settings.get('chord_bracket_style', 'square')
         self.comment_style = self.export_settings.get('comment_style', 'chordpro')
         
+        # Resolve the chord bracket style once (default to square brackets)
+        self.chord_format = {
+            'square': '[%s]',
+            'round': '(%s)',
+            'curly': '{%s}',
+        }.get(self.chord_bracket_style, '[%s]')
+        
+        # Songs reuse a handful of chord names many times
+        self._format_chord = lru_cache(maxsize=256)(self._format_chord)
+        
         self.logger.debug("Initialized ChordPro exporter")
     
     def export(self, song: Song) -> str:
@@ -83,7 +106,6 @@ class ChordProExporter:
         
         # Source file (if available)
         if self.add_metadata and song.source_file:
-            import os
             filename = os.path.basename(song.source_file)
             header_lines.append(f"{{meta: source {filename}}}")
         
@@ -142,82 +164,81 @@ class ChordProExporter:
         if verse.verse_type == "comment":
             return self._export_comment_verse(verse)
         
+        # Role marker goes on the first line; continuation lines are aligned
+        # with a tab when the verse has a role
+        role = verse.role
+        if role:
+            first_prefix = f"{role}\t" if self.use_tabs else f"{role} "
+            continuation_prefix = "\t" if self.use_tabs else ""
+        else:
+            first_prefix = continuation_prefix = ""
+        
         # Regular verse
+        export_line = self._export_verse_line
+        append = verse_lines.append
+        
         for i, line in enumerate(verse.lines):
-            chordpro_line = self._export_verse_line(line, verse.role, i == 0)
+            chordpro_line = export_line(line, first_prefix if i == 0 else continuation_prefix)
             if chordpro_line:
-                verse_lines.append(chordpro_line)
+                append(chordpro_line)
         
         return verse_lines
     
     def _export_comment_verse(self, verse: Verse) -> List[str]:
         """Export a comment verse"""
         comment_lines = []
+        use_chordpro_comments = self.comment_style == 'chordpro'
         
         for line in verse.lines:
             text = line.text.strip()
             
-            # Check if already in ChordPro comment format
-            if text.startswith("{comment:") or text.startswith("{c:"):
-                comment_lines.append(text)
+            # Format as ChordPro comment unless it already is one
+            if use_chordpro_comments and not text.startswith(("{comment:", "{c:")):
+                comment_lines.append(f"{{comment: {text}}}")
             else:
-                # Format as ChordPro comment
-                if self.comment_style == 'chordpro':
-                    comment_lines.append(f"{{comment: {text}}}")
-                else:
-                    comment_lines.append(text)
+                comment_lines.append(text)
         
         return comment_lines
     
-    def _export_verse_line(self, line: VerseLine, role: str, is_first_line: bool) -> str:
-        """Export a single verse line with chords"""
+    def _export_verse_line(self, line: VerseLine, prefix: str) -> str:
+        """Export a single verse line with chords, after its role/alignment prefix"""
         if not line.text.strip():
             return ""
         
         # Build the line with positioned chords
-        chordpro_line = self._build_line_with_chords(line)
-        
-        # Add role marker for first line
-        if is_first_line and role:
-            if self.use_tabs:
-                return f"{role}\t{chordpro_line}"
-            else:
-                return f"{role} {chordpro_line}"
-        else:
-            # Continuation line
-            if role and self.use_tabs:
-                return f"\t{chordpro_line}"
-            else:
-                return chordpro_line
+        return prefix + self._build_line_with_chords(line)
     
     def _build_line_with_chords(self, line: VerseLine) -> str:
-        """Build a line with properly positioned chords"""
+        """Build a line with properly positioned chords (line.chords are ordered by position)"""
         if not line.chords:
             return line.text
         
-        # Sort chords by position
-        sorted_chords = sorted(line.chords, key=lambda c: c.position)
+        # Fast path: a single chord needs no loop
+        if len(line.chords) == 1:
+            chord = line.chords[0]
+            split_pos = chord.position if chord.position > 0 else 0
+            return line.text[:split_pos] + self._format_chord(chord.chord) + line.text[split_pos:]
         
-        result = ""
+        text = line.text
+        parts = []
         text_pos = 0
         
-        for chord in sorted_chords:
+        for chord in line.chords:
             chord_pos = chord.position
             
             # Add text up to chord position
             if chord_pos > text_pos:
-                result += line.text[text_pos:chord_pos]
+                parts.append(text[text_pos:chord_pos])
                 text_pos = chord_pos
             
             # Add chord in appropriate format
-            chord_text = self._format_chord(chord.chord)
-            result += chord_text
+            parts.append(self._format_chord(chord.chord))
         
         # Add remaining text
-        if text_pos < len(line.text):
-            result += line.text[text_pos:]
+        if text_pos < len(text):
+            parts.append(text[text_pos:])
         
-        return result
+        return "".join(parts)
     
     def _format_chord(self, chord: str) -> str:
         """Format a chord according to the configured style"""
@@ -231,14 +252,7 @@ class ChordProExporter:
             return chord  # Already formatted
 
         # Apply chord bracket style
-        if self.chord_bracket_style == 'square':
-            return f"[{chord}]"
-        elif self.chord_bracket_style == 'round':
-            return f"({chord})"
-        elif self.chord_bracket_style == 'curly':
-            return f"{{{chord}}}"
-        else:
-            return f"[{chord}]"  # Default to square brackets
+        return self.chord_format % chord
     
     def _export_comments(self, comments: List[Comment]) -> List[str]:
         """Export general comments"""
@@ -263,32 +277,26 @@ class ChordProExporter:
     
     def _apply_final_formatting(self, content: str) -> str:
         """Apply final formatting rules to the ChordPro content"""
-        lines = content.split('\n')
-        formatted_lines = []
+        # Apply language-specific text fixes (single-character fixes, so they
+        # can run over the whole content at once)
+        content = self.config.fix_text_encoding(content)
         
-        for line in lines:
-            # Apply language-specific text fixes
-            fixed_line = self.config.fix_text_encoding(line)
-            
-            # Apply spacing rules
-            if not self.preserve_spacing:
-                # Normalize whitespace
-                fixed_line = ' '.join(fixed_line.split())
-            
-            formatted_lines.append(fixed_line)
+        # Apply spacing rules
+        if not self.preserve_spacing:
+            # Normalize whitespace: trim each line and collapse inner runs
+            content = _LINE_EDGE_WHITESPACE_RE.sub('', content)
+            content = _WHITESPACE_RUN_RE.sub(' ', content)
+        
+        formatted_lines = content.split('\n')
         
-        # Remove excessive empty lines
+        # Remove excessive empty lines (keep only the first of each empty run)
         result_lines = []
-        prev_empty = False
         
-        for line in formatted_lines:
-            is_empty = not line.strip()
-            
-            if is_empty and prev_empty:
-                continue  # Skip consecutive empty lines
-            
-            result_lines.append(line)
-            prev_empty = is_empty
+        for is_empty, group in groupby(formatted_lines, key=lambda line: not line.strip()):
+            if is_empty:
+                result_lines.append(next(group))
+            else:
+                result_lines.extend(group)
         
         return '\n'.join(result_lines)
     
@@ -303,15 +311,13 @@ class ChordProExporter:
             List of validation issues (empty if valid)
         """
         issues = []
-        lines = content.split('\n')
         
         # Check for required title
-        has_title = any(line.strip().startswith('{title:') for line in lines)
-        if not has_title:
+        if not _TITLE_DIRECTIVE_RE.search(content):
             issues.append("Missing {title:} directive")
         
         # Check for malformed directives
-        for i, line in enumerate(lines, 1):
+        for i, line in enumerate(content.split('\n'), 1):
             stripped = line.strip()
             
             # Check for unclosed directives
@@ -334,29 +340,22 @@ class ChordProExporter:
             'total_verses': len(song.verses),
             'total_comments': len(song.comments),
             'has_kapodaster': bool(song.kapodaster),
-            'verse_types': {},
-            'role_distribution': {},
+            'verse_types': Counter(verse.verse_type for verse in song.verses),
+            'role_distribution': Counter(verse.role or 'no_role' for verse in song.verses),
             'total_chords': 0,
-            'unique_chords': set()
+            'unique_chords': 0
         }
         
-        # Analyze verses
+        # Count chords
+        unique_chords = set()
+        total_chords = 0
+        
         for verse in song.verses:
-            # Count verse types
-            verse_type = verse.verse_type
-            stats['verse_types'][verse_type] = stats['verse_types'].get(verse_type, 0) + 1
-            
-            # Count roles
-            role = verse.role or 'no_role'
-            stats['role_distribution'][role] = stats['role_distribution'].get(role, 0) + 1
-            
-            # Count chords
             for line in verse.lines:
-                stats['total_chords'] += len(line.chords)
-                for chord in line.chords:
-                    stats['unique_chords'].add(chord.chord)
+                total_chords += len(line.chords)
+                unique_chords.update(chord.chord for chord in line.chords)
         
-        # Convert set to count
-        stats['unique_chords'] = len(stats['unique_chords'])
+        stats['total_chords'] = total_chords
+        stats['unique_chords'] = len(unique_chords)
         
         return stats
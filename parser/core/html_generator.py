@@ -6,7 +6,8 @@ and styling for web display and printing.
 """
 
 import logging
-from typing import List, Dict, Optional, Tuple
+from functools import lru_cache
+from typing import List, Dict, Optional, Protocol, Tuple, TextIO
 from datetime import datetime
 import html
 
@@ -14,94 +15,12 @@ from core.models import Song, Verse, VerseLine, Comment, Chord
 from languages.base_language import LanguageConfig
 
 
-class HTMLGenerator:
-    """
-    Generates HTML output from Song objects.
-    
-    Creates styled HTML with proper chord positioning, responsive design,
-    and print-friendly formatting.
-    """
-    
-    def __init__(self, language_config: LanguageConfig):
-        self.config = language_config
-        self.logger = logging.getLogger(__name__)
-        
-        # HTML generation settings
-        self.font_family = "Arial, sans-serif"
-        self.chord_color = "#d63384"  # Bootstrap pink
-        self.role_color = "#0d6efd"   # Bootstrap blue
-        
-        # Spacing and sizing
-        self.base_font_size = "14px"
-        self.chord_font_size = "12px"
-        self.title_font_size = "24px"
-        self.line_height = "1.6"
-        
-        self.logger.debug("Initialized HTML generator")
-    
-    def generate(self, song: Song) -> str:
-        """
-        Generate HTML from a Song object.
-        
-        Args:
-            song: Song object to convert
-            
-        Returns:
-            Complete HTML document as string
-        """
-        self.logger.info(f"Generating HTML for song '{song.title}'")
-        
-        # Build HTML components
-        html_parts = []
-        
-        # HTML document structure
-        html_parts.append(self._generate_html_header(song))
-        html_parts.append(self._generate_css_styles())
-        html_parts.append("</head>")
-        html_parts.append("<body>")
-        html_parts.append('<div class="song-container">')
-        
-        # Song content
-        html_parts.append(self._generate_title(song.title))
-        
-        if song.kapodaster:
-            html_parts.append(self._generate_kapodaster(song.kapodaster))
-        
-        html_parts.append(self._generate_verses(song.verses))
-        
-        if song.comments:
-            html_parts.append(self._generate_comments(song.comments))
-        
-        # Close document
-        html_parts.append("</div>")
-        html_parts.append("</body>")
-        html_parts.append("</html>")
-        
-        html_content = "\n".join(html_parts)
-        
-        self.logger.info("HTML generation complete")
-        return html_content
-    
-    def _generate_html_header(self, song: Song) -> str:
-        """Generate HTML document header"""
-        title = html.escape(song.title)
-        
-        return f"""<!DOCTYPE html>
-<html lang="{self.config.language_code}">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title}</title>
-    <meta name="generator" content="Universal Songbook Parser">
-    <meta name="language" content="{self.config.language_code}">"""
-    
-    def _generate_css_styles(self) -> str:
-        """Generate CSS styles for the HTML document"""
-        return f"""    <style>
+# Document stylesheet; the {placeholders} are filled from HTMLGenerator settings
+_CSS_TEMPLATE = """    <style>
         body {{
-            font-family: {self.font_family};
-            font-size: {self.base_font_size};
-            line-height: {self.line_height};
+            font-family: {font_family};
+            font-size: {base_font_size};
+            line-height: {line_height};
             margin: 0;
             padding: 20px;
             background-color: #ffffff;
@@ -118,7 +37,7 @@ class HTMLGenerator:
         }}
         
         .song-title {{
-            font-size: {self.title_font_size};
+            font-size: {title_font_size};
             font-weight: bold;
             text-align: center;
             margin-bottom: 20px;
@@ -150,7 +69,7 @@ class HTMLGenerator:
         }}
         
         .role-marker {{
-            color: {self.role_color};
+            color: {role_color};
             font-weight: bold;
             display: inline-block;
             min-width: 60px;
@@ -158,8 +77,8 @@ class HTMLGenerator:
         }}
         
         .chord {{
-            color: {self.chord_color};
-            font-size: {self.chord_font_size};
+            color: {chord_color};
+            font-size: {chord_font_size};
             font-weight: bold;
             position: relative;
             top: -0.3em;
@@ -234,6 +153,165 @@ class HTMLGenerator:
             }}
         }}
     </style>"""
+
+
+@lru_cache(maxsize=256)
+def _chord_html(chord: str) -> str:
+    """Render a chord span; songs reuse a handful of chord names many times"""
+    return f'<span class="chord">[{html.escape(chord)}]</span>'
+
+
+class _HTMLSink(Protocol):
+    """Anything the document builders can append HTML lines to (a list or a _LineWriter)"""
+    
+    def append(self, line: str) -> None: ...
+
+
+class _LineWriter:
+    """
+    Append-only sink that streams HTML lines to a text stream.
+    
+    Stands in for the html_parts list, writing lines "\n"-separated exactly
+    as "\n".join() would.
+    """
+    
+    def __init__(self, output: TextIO):
+        self.output = output
+        self.has_lines = False
+    
+    def append(self, line: str) -> None:
+        if self.has_lines:
+            self.output.write("\n")
+        self.output.write(line)
+        self.has_lines = True
+
+
+class HTMLGenerator:
+    """
+    Generates HTML output from Song objects.
+    
+    Creates styled HTML with proper chord positioning, responsive design,
+    and print-friendly formatting.
+    """
+    
+    def __init__(self, language_config: LanguageConfig):
+        self.config = language_config
+        self.logger = logging.getLogger(__name__)
+        
+        # HTML generation settings
+        self.font_family = "Arial, sans-serif"
+        self.chord_color = "#d63384"  # Bootstrap pink
+        self.role_color = "#0d6efd"   # Bootstrap blue
+        
+        # Spacing and sizing
+        self.base_font_size = "14px"
+        self.chord_font_size = "12px"
+        self.title_font_size = "24px"
+        self.line_height = "1.6"
+        
+        # Formatted stylesheet, cached by _generate_css_styles
+        self._css = ""
+        self._css_settings = None
+        
+        self.logger.debug("Initialized HTML generator")
+    
+    def generate(self, song: Song) -> str:
+        """
+        Generate HTML from a Song object.
+        
+        Args:
+            song: Song object to convert
+            
+        Returns:
+            Complete HTML document as string
+        """
+        return self._generate_html(song)
+    
+    def _generate_html(self, song: Song, custom_css: Optional[str] = None) -> str:
+        """Build the complete HTML document for a song as a single string"""
+        html_parts = []
+        self._generate_document(song, html_parts, custom_css)
+        
+        return "\n".join(html_parts)
+    
+    def generate_to(self, song: Song, output: TextIO) -> None:
+        """
+        Generate HTML from a Song object, writing it to a text stream.
+        
+        Writes the same document as generate() line by line, without
+        building the whole document in memory first.
+        
+        Args:
+            song: Song object to convert
+            output: Writable text stream (e.g. an open file)
+        """
+        self._generate_document(song, _LineWriter(output))
+    
+    def _generate_document(self, song: Song, html_parts: _HTMLSink, custom_css: Optional[str] = None) -> None:
+        """Append the complete HTML document for a song to html_parts"""
+        self.logger.info(f"Generating HTML for song '{song.title}'")
+        
+        # HTML document structure
+        html_parts.append(self._generate_html_header(song))
+        html_parts.append(self._generate_css_styles())
+        if custom_css is not None:
+            html_parts.append(f"\n    <style>\n{custom_css}\n    </style>")
+        html_parts.append("</head>")
+        html_parts.append("<body>")
+        html_parts.append('<div class="song-container">')
+        
+        # Song content
+        html_parts.append(self._generate_title(song.title))
+        
+        if song.kapodaster:
+            html_parts.append(self._generate_kapodaster(song.kapodaster))
+        
+        self._generate_verses(song.verses, html_parts)
+        
+        if song.comments:
+            self._generate_comments(song.comments, html_parts)
+        
+        # Close document
+        html_parts.append("</div>")
+        html_parts.append("</body>")
+        html_parts.append("</html>")
+        
+        self.logger.info("HTML generation complete")
+    
+    def _generate_html_header(self, song: Song) -> str:
+        """Generate HTML document header"""
+        title = html.escape(song.title)
+        
+        return f"""<!DOCTYPE html>
+<html lang="{self.config.language_code}">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title}</title>
+    <meta name="generator" content="Universal Songbook Parser">
+    <meta name="language" content="{self.config.language_code}">"""
+    
+    def _generate_css_styles(self) -> str:
+        """Generate CSS styles for the HTML document"""
+        settings = (
+            self.font_family, self.base_font_size, self.line_height, self.title_font_size,
+            self.role_color, self.chord_color, self.chord_font_size,
+        )
+        
+        # Format the stylesheet only when the style settings change
+        if settings != self._css_settings:
+            self._css = _CSS_TEMPLATE.format(
+                font_family=self.font_family,
+                base_font_size=self.base_font_size,
+                line_height=self.line_height,
+                title_font_size=self.title_font_size,
+                role_color=self.role_color,
+                chord_color=self.chord_color,
+                chord_font_size=self.chord_font_size,
+            )
+            self._css_settings = settings
+        
+        return self._css
     
     def _generate_title(self, title: str) -> str:
         """Generate HTML for song title"""
@@ -245,118 +323,113 @@ class HTMLGenerator:
         escaped_kapodaster = html.escape(kapodaster.strip())
         return f'    <div class="kapodaster">{escaped_kapodaster}</div>'
     
-    def _generate_verses(self, verses: List[Verse]) -> str:
-        """Generate HTML for all verses"""
-        if not verses:
-            return ""
-        
-        verse_html_parts = []
-        
+    def _generate_verses(self, verses: List[Verse], html_parts: _HTMLSink) -> None:
+        """Append HTML for all verses to html_parts"""
         for verse in verses:
-            verse_html = self._generate_verse(verse)
-            if verse_html:
-                verse_html_parts.append(verse_html)
-        
-        return "\n".join(verse_html_parts)
+            self._generate_verse(verse, html_parts)
     
-    def _generate_verse(self, verse: Verse) -> str:
-        """Generate HTML for a single verse"""
+    def _generate_verse(self, verse: Verse, html_parts: _HTMLSink) -> None:
+        """Append HTML for a single verse to html_parts"""
         if not verse.lines:
-            return ""
+            return
         
         # Handle comment verses differently
         if verse.verse_type == "comment":
-            return self._generate_comment_verse(verse)
+            self._generate_comment_verse(verse, html_parts)
+            return
+        
+        html_parts.append('    <div class="verse">')
+        
+        # Role marker is shown on the first line only
+        role_html = ""
+        if verse.role:
+            role_html = f'<span class="role-marker">{html.escape(verse.role)}</span>'
         
-        verse_parts = []
-        verse_parts.append('    <div class="verse">')
+        generate_line = self._generate_verse_line
+        append = html_parts.append
         
         for i, line in enumerate(verse.lines):
-            line_html = self._generate_verse_line(line, verse.role, i == 0)
+            line_html = generate_line(line, role_html if i == 0 else "")
             if line_html:
-                verse_parts.append(f"        {line_html}")
+                append(f"        {line_html}")
         
-        verse_parts.append('    </div>')
-        
-        return "\n".join(verse_parts)
+        html_parts.append('    </div>')
     
-    def _generate_comment_verse(self, verse: Verse) -> str:
-        """Generate HTML for a comment verse"""
-        comment_parts = []
-        
+    def _generate_comment_verse(self, verse: Verse, html_parts: _HTMLSink) -> None:
+        """Append HTML for a comment verse to html_parts"""
         for line in verse.lines:
             text = line.text.strip()
             if text:
                 escaped_text = html.escape(text)
-                comment_parts.append(f'    <div class="comment">{escaped_text}</div>')
-        
-        return "\n".join(comment_parts)
+                html_parts.append(f'    <div class="comment">{escaped_text}</div>')
     
-    def _generate_verse_line(self, line: VerseLine, role: str, is_first_line: bool) -> str:
-        """Generate HTML for a single verse line with chords"""
+    def _generate_verse_line(self, line: VerseLine, role_html: str) -> str:
+        """Generate HTML for a single verse line with chords, after its role marker HTML"""
         if not line.text.strip():
             return ""
         
         # Build line with chords
         line_content = self._build_line_with_chords_html(line.text, line.chords)
         
-        # Add role marker for first line
-        role_html = ""
-        if is_first_line and role:
-            escaped_role = html.escape(role)
-            role_html = f'<span class="role-marker">{escaped_role}</span>'
-        
         return f'<div class="verse-line">{role_html}{line_content}</div>'
     
     def _build_line_with_chords_html(self, text: str, chords: List[Chord]) -> str:
-        """Build HTML for a line with positioned chords"""
+        """Build HTML for a line with positioned chords (chords are ordered by position)"""
         if not chords:
             escaped_text = html.escape(text)
             return f'<span class="lyrics">{escaped_text}</span>'
         
-        # Sort chords by position
-        sorted_chords = sorted(chords, key=lambda c: c.position)
+        escape = html.escape
+        text_len = len(text)
+        
+        # Fast path: a single chord needs no loop
+        if len(chords) == 1:
+            chord = chords[0]
+            chord_pos = chord.position
+            if chord_pos > text_len:
+                chord_pos = text_len
+            split_pos = chord_pos if chord_pos > 0 else 0
+            
+            line_html = _chord_html(chord.chord)
+            if split_pos > 0:
+                line_html = f'<span class="lyrics">{escape(text[:split_pos])}</span>' + line_html
+            if split_pos < text_len:
+                line_html += f'<span class="lyrics">{escape(text[split_pos:])}</span>'
+            return line_html
         
         result_parts = []
+        append = result_parts.append
         text_pos = 0
         
-        for chord in sorted_chords:
-            chord_pos = min(chord.position, len(text))
+        # Text between consecutive chord positions is one lyrics run, so each
+        # run is escaped and wrapped exactly once
+        for chord in chords:
+            chord_pos = chord.position
+            if chord_pos > text_len:
+                chord_pos = text_len
             
             # Add text up to chord position
             if chord_pos > text_pos:
-                text_segment = text[text_pos:chord_pos]
-                escaped_segment = html.escape(text_segment)
-                result_parts.append(f'<span class="lyrics">{escaped_segment}</span>')
+                append(f'<span class="lyrics">{escape(text[text_pos:chord_pos])}</span>')
                 text_pos = chord_pos
             
             # Add chord
-            escaped_chord = html.escape(chord.chord)
-            result_parts.append(f'<span class="chord">[{escaped_chord}]</span>')
+            append(_chord_html(chord.chord))
         
         # Add remaining text
-        if text_pos < len(text):
-            remaining_text = text[text_pos:]
-            escaped_remaining = html.escape(remaining_text)
-            result_parts.append(f'<span class="lyrics">{escaped_remaining}</span>')
+        if text_pos < text_len:
+            append(f'<span class="lyrics">{escape(text[text_pos:])}</span>')
         
         return "".join(result_parts)
     
-    def _generate_comments(self, comments: List[Comment]) -> str:
-        """Generate HTML for general comments"""
-        if not comments:
-            return ""
-        
-        comment_parts = []
-        
+    def _generate_comments(self, comments: List[Comment], html_parts: _HTMLSink) -> None:
+        """Append HTML for general comments to html_parts"""
         for comment in comments:
             if comment.comment_type == "general":
                 text = comment.text.strip()
                 if text:
                     escaped_text = html.escape(text)
-                    comment_parts.append(f'    <div class="comment">{escaped_text}</div>')
-        
-        return "\n".join(comment_parts)
+                    html_parts.append(f'    <div class="comment">{escaped_text}</div>')
     
     def generate_minimal_html(self, song: Song) -> str:
         """
@@ -379,11 +452,11 @@ class HTMLGenerator:
             parts.append(self._generate_kapodaster(song.kapodaster))
         
         # Verses
-        parts.append(self._generate_verses(song.verses))
+        self._generate_verses(song.verses, parts)
         
         # Comments
         if song.comments:
-            parts.append(self._generate_comments(song.comments))
+            self._generate_comments(song.comments, parts)
         
         return "\n".join(parts)
     
@@ -398,46 +471,33 @@ class HTMLGenerator:
         Returns:
             Complete HTML document with custom styles
         """
-        # Generate standard HTML
-        html_content = self.generate(song)
-        
-        # Insert custom CSS before closing </head>
-        css_insertion_point = html_content.find("</head>")
-        if css_insertion_point != -1:
-            custom_style_tag = f"\n    <style>\n{custom_css}\n    </style>\n"
-            html_content = (
-                html_content[:css_insertion_point] +
-                custom_style_tag +
-                html_content[css_insertion_point:]
-            )
-        
-        return html_content
+        # Custom styles go right before the closing </head>
+        return self._generate_html(song, custom_css)
     
     def get_generation_stats(self, song: Song) -> Dict[str, any]:
         """Get statistics about HTML generation"""
-        stats = {
-            'title': song.title,
-            'language': song.language,
-            'total_verses': len(song.verses),
-            'total_comments': len(song.comments),
-            'has_kapodaster': bool(song.kapodaster),
-            'total_lines': sum(len(verse.lines) for verse in song.verses),
-            'total_chords': sum(
-                len(line.chords) 
-                for verse in song.verses 
-                for line in verse.lines
-            ),
-            'estimated_html_size': 0  # Will be calculated after generation
-        }
+        total_lines = 0
+        total_chords = 0
         
         # Estimate HTML size (rough calculation)
         estimated_size = len(song.title) * 2  # Title with markup
         
         for verse in song.verses:
+            total_lines += len(verse.lines)
+            
             for line in verse.lines:
+                chord_count = len(line.chords)
+                total_chords += chord_count
                 estimated_size += len(line.text) * 3  # Text with markup
-                estimated_size += len(line.chords) * 20  # Chord markup
-        
-        stats['estimated_html_size'] = estimated_size
+                estimated_size += chord_count * 20  # Chord markup
         
-        return stats
+        return {
+            'title': song.title,
+            'language': song.language,
+            'total_verses': len(song.verses),
+            'total_comments': len(song.comments),
+            'has_kapodaster': bool(song.kapodaster),
+            'total_lines': total_lines,
+            'total_chords': total_chords,
+            'estimated_html_size': estimated_size
+        }
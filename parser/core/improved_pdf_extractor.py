@@ -9,12 +9,18 @@ This module combines the best features from both working parsers:
 """
 
 import fitz  # PyMuPDF
+import re
 import logging
+from bisect import bisect_left
+from functools import lru_cache
 from typing import List, Dict, Any, Tuple, Optional
 from pathlib import Path
 
 from core.models import PDFTextElement
 
+# Image blocks are skipped below, so don't have MuPDF extract their pixel data
+_TEXT_DICT_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+
 
 class ImprovedPDFExtractor:
     """
@@ -49,6 +55,63 @@ class ImprovedPDFExtractor:
             15466635,  # Slight variation
         }
         
+        # Chord and title patterns, compiled once instead of on every word
+        self.spaced_chord_pattern = re.compile(r'([A-H][a-z]*)\s+(\d+)')  # "H 7" -> "H7"
+        self.chord_root_pattern = re.compile(r'([A-H][a-z]*)')
+        self.spanish_chord_pattern = re.compile(r'^(DO|Do|Re|Mi|Fa|Sol|La|Si)([#b]?)([–\-]?)(\d*|maj7|dim|aum)$')
+        self.spanish_chord_span_pattern = re.compile(r'((?:DO|Do|Re|Mi|Fa|Sol|La|Si)(?:[#b]?)(?:[–\-]?))\s*(\d+|maj7|dim|aum)?')
+        self.italian_chord_span_pattern = re.compile(r'((?:Do|Re|Mi|Fa|Sol|La|Si)(?:[#b]?)(?:(?:\s+|)(?:[mb]|maj7|dim|aug|sus[24]|\d+))*)')
+        self.chord_unit_gap_pattern = re.compile(r'\s{4,}')
+        self.title_reference_pattern = re.compile(r'\s*-\s*[A-Za-z][^(]*(\([^)]*\))?[^A-Z]*$')
+        self.parentheses_pattern = re.compile(r'\([^)]*\)')
+        self.capo_fret_pattern = re.compile(r'\b(i{1,3}|iv|v|vi{0,3}|ix|x|\d+)\s*(tasto|fret)\b')
+        
+        # Italian subtitle markers (book abbreviations, liturgical seasons),
+        # matched anywhere in the lowercased line with one alternation scan
+        italian_subtitle_markers = (
+            'cfr.', 'gen ', 'mt ', 'mc ', 'lc ', 'gv ', 'at ', 'rm ', 'cor ', 'gal ', 'ef ', 'fil ', 'col ',
+            'ts ', 'tm ', 'tt ', 'fm ', 'eb ', 'gc ', 'pt ', 'ap ', 'sal ', 'is ', 'ger ', 'ez ',
+            'dn ', 'os ', 'gl ', 'am ', 'ab ', 'gn ', 'mi ', 'na ', 'so ', 'ag ', 'zc ', 'ml ',
+            'tempo di', 'quaresima', 'avvento', 'pasqua', 'natale', 'ordinario',
+        )
+        self.italian_subtitle_pattern = re.compile('|'.join(map(re.escape, italian_subtitle_markers)))
+        
+        # Italian capo patterns: "Barrè al III tasto", "Barrè al II tasto", etc.
+        self.italian_capo_patterns = ('barrè al', 'barre al', 'capotasto al', 'capo al')
+        self.italian_chord_roots = ('Do', 'Re', 'Mi', 'Fa', 'Sol', 'La', 'Si')
+        self.italian_merged_chord_pattern = re.compile(r'(Do|Re|Mi|Fa|Sol|La|Si)(.*)', re.DOTALL)  # "Rem9" -> "Re", "m9"
+        # Extensions split off a merged major chord, e.g. "Re7" -> "Re 7"
+        self.italian_merged_extensions = frozenset([
+            '7', '9', '6', '4', '2', '11', '13', 'maj7', 'dim', 'aug', 'sus4', 'sus2',
+        ])
+        self.bold_font_indicators = ('bold', 'black', 'heavy', 'semibold', 'demibold', 'extrabold')
+        
+        # config.valid_chords rebuilds its set on every access, so take a snapshot
+        self.valid_chords = frozenset(self.config.valid_chords)
+        self.chord_letters = frozenset(getattr(self.config, 'chord_letters', ()))
+        # Normalizing keeps a word's first character, so only words starting
+        # like some valid chord can split into two chords
+        self.chord_initials = frozenset(chord[0] for chord in self.valid_chords if chord)
+        
+        # Words that can follow an Italian chord root within one chord unit
+        self.italian_chord_extensions = frozenset([
+            'm', 'b', 'maj', 'min', 'dim', 'aug', 'add', 'sus4', 'sus2', '+', '°',
+            '6', '7', '9', '11', '13',
+        ])
+        
+        # Longest role markers first, so "K.+Z." wins over "K."
+        self.role_markers_by_length = tuple(sorted(self.config.role_markers, key=len, reverse=True))
+        
+        # The same chord tokens repeat on every chord line, so memoize the
+        # per-token helpers on this instance (chord sets are per-config)
+        self._normalize_chord = lru_cache(maxsize=4096)(self._normalize_chord)
+        self._looks_like_chord = lru_cache(maxsize=4096)(self._looks_like_chord)
+        self._looks_like_spanish_chord = lru_cache(maxsize=4096)(self._looks_like_spanish_chord)
+        self._char_widths_at_size = lru_cache(maxsize=64)(self._char_widths_at_size)
+        self._looks_like_italian_chord = lru_cache(maxsize=4096)(self._looks_like_italian_chord)
+        self._normalize_merged_italian_chord_in_extractor = lru_cache(maxsize=2048)(
+            self._normalize_merged_italian_chord_in_extractor)
+        
         self.logger.debug("Initialized improved PDF extractor")
     
     def get_char_width(self, char: str, font_size: float) -> float:
@@ -56,6 +119,12 @@ class ImprovedPDFExtractor:
         font_units = self.arial_char_widths.get(char, 556)  # 556 is average Arial character width
         return (font_units / 1000.0) * font_size
     
+    def _char_widths_at_size(self, font_size: float) -> Tuple[Dict[str, float], float]:
+        """Get the widths of all known Arial characters, and the fallback width, at a font size"""
+        widths = {char: (font_units / 1000.0) * font_size
+                  for char, font_units in self.arial_char_widths.items()}
+        return widths, (556 / 1000.0) * font_size
+    
     def extract(self, pdf_path: str) -> Dict[str, List[Dict]]:
         """
         Extract span data from PDF with proper classification.
@@ -82,25 +151,50 @@ class ImprovedPDFExtractor:
         
         self.logger.debug(f"Processing {len(doc)} page(s)")
         
+        # Per-line debug messages are only built when they will be emitted
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        
+        # Resolve language-specific behaviour once instead of on every line
+        is_spanish = self.config.language_code == "es"
+        italian_role_line = getattr(self.config, 'is_role_line', None) if self.config.language_code == "it" else None
+        
         # Process all pages
         for page_num in range(len(doc)):
             page = doc[page_num]
-            text_dict = page.get_text("dict")
+            text_dict = page.get_text("dict", flags=_TEXT_DICT_FLAGS)
+            
+            # Y offset of this page for multi-page documents (page.rect is built on every access)
+            page_y_offset = page_num * page.rect.height
             
             self.logger.debug(f"Processing page {page_num + 1}/{len(doc)}")
             
             for block in text_dict["blocks"]:
                 if "lines" in block:
                     for line in block["lines"]:
-                        line_text = ''.join([span['text'] for span in line['spans']])
+                        all_spans = line['spans']
+                        if not all_spans:
+                            continue
+                        
+                        # Join the span texts and find the line's horizontal extent
+                        # (leftmost span start, rightmost span end) in a single pass
+                        text_parts = []
+                        min_x = float('inf')
+                        max_x = float('-inf')
+                        for span in all_spans:
+                            text_parts.append(span['text'])
+                            span_bbox = span['bbox']
+                            if span_bbox[0] < min_x:
+                                min_x = span_bbox[0]
+                            if span_bbox[2] > max_x:
+                                max_x = span_bbox[2]
+                        line_text = ''.join(text_parts)
+                        stripped_text = line_text.strip()
                         
-                        if not line_text.strip():
+                        if not stripped_text:
                             continue
                         
                         # Get the main span for analysis
-                        main_span = line['spans'][0] if line['spans'] else None
-                        if not main_span:
-                            continue
+                        main_span = all_spans[0]
                         
                         # Extract color and font information
                         color = main_span.get('color', 0)  # 0 = black, other values = colors
@@ -110,31 +204,22 @@ class ImprovedPDFExtractor:
                         # Convert color to RGB for analysis (pink detection)
                         is_pink = self._is_pink_color(color)
 
-                        # Detect bold font from font name
-                        is_bold = self._is_bold_font(font_name)
-
-                        # Get exact RGB color values for debugging
-                        rgb_color = self._get_rgb_color(color)
-
                         # Debug exact color for Spanish songs
-                        if self.config.language_code == "es" and line_text.strip():
-                            self.logger.debug(f"🎨 COLOR DEBUG: '{line_text.strip()[:30]}...' | "
+                        if debug and is_spanish:
+                            # Get exact RGB color values for debugging
+                            rgb_color = self._get_rgb_color(color)
+                            self.logger.debug(f"🎨 COLOR DEBUG: '{stripped_text[:30]}...' | "
                                             f"color_int: {color} | RGB: {rgb_color} | "
                                             f"is_pink: {is_pink} | font_size: {font_size:.1f} | "
                                             f"font: {font_name}")
 
                         # Adjust Y coordinate for multi-page (add page offset)
-                        page_height = page.rect.height
-                        adjusted_y = line['bbox'][1] + (page_num * page_height)
-                        
-                        # Calculate proper span boundaries for multi-span lines
-                        all_spans = line['spans']
-                        min_x = min(span['bbox'][0] for span in all_spans)
-                        max_x = max(span['bbox'][2] for span in all_spans)
+                        adjusted_y = line['bbox'][1] + page_y_offset
+
 
                         line_data = {
                             'text': line_text,
-                            'text_content': line_text.strip(),
+                            'text_content': stripped_text,
                             'x_start': min_x,  # Use leftmost span start
                             'x_end': max_x,    # Use rightmost span end
                             'width': max_x - min_x,  # Calculate full width across all spans
@@ -145,51 +230,57 @@ class ImprovedPDFExtractor:
                             'color': color,
                             'is_pink': is_pink,
                             'font_name': font_name,
-                            'spans': line['spans']  # Keep all spans for multi-span lines
+                            'spans': all_spans  # Keep all spans for multi-span lines
                         }
                         
                         # Classify the line based on content, color, and font
                         if self._is_chord_line_text(line_text, color, font_size):
                             chord_lines.append(line_data)
-                            # Enhanced debug for Spanish red chords
-                            if self.config.language_code == "es":
-                                is_red = self._is_red_color(color)
-                                self.logger.debug(f"🎼 Chord line (page {page_num + 1}): '{line_text.strip()}' (red: {is_red}, pink: {is_pink}, size: {font_size:.1f})")
-                            else:
-                                self.logger.debug(f"🎼 Chord line (page {page_num + 1}): '{line_text.strip()}' (pink: {is_pink}, size: {font_size:.1f})")
+                            if debug:
+                                # Enhanced debug for Spanish red chords
+                                if is_spanish:
+                                    is_red = self._is_red_color(color)
+                                    self.logger.debug(f"🎼 Chord line (page {page_num + 1}): '{stripped_text}' (red: {is_red}, pink: {is_pink}, size: {font_size:.1f})")
+                                else:
+                                    self.logger.debug(f"🎼 Chord line (page {page_num + 1}): '{stripped_text}' (pink: {is_pink}, size: {font_size:.1f})")
                         
-                        elif self._is_title_line(line_text, font_size, is_pink, color):
+                        elif self._is_title_line(stripped_text, font_size, is_pink, color):
                             title_lines.append(line_data)
                             subtitle_detection_active = True  # Activate subtitle detection after finding title
-                            self.logger.debug(f"📋 Title line (page {page_num + 1}): '{line_text.strip()}' (pink: {is_pink}, size: {font_size:.1f})")
+                            if debug:
+                                self.logger.debug(f"📋 Title line (page {page_num + 1}): '{stripped_text}' (pink: {is_pink}, size: {font_size:.1f})")
                             if "SL - 110.pdf" in pdf_path or "SL - 128.pdf" in pdf_path:
-                                print(f"🎯 FOUND TITLE in {pdf_path}: '{line_text.strip()[:50]}...' (size: {font_size:.1f}, pink: {is_pink})")
+                                print(f"🎯 FOUND TITLE in {pdf_path}: '{stripped_text[:50]}...' (size: {font_size:.1f}, pink: {is_pink})")
 
-                        elif subtitle_detection_active and not found_first_role and self._is_subtitle_line(line_text, font_size, color, page_num):
+                        elif subtitle_detection_active and not found_first_role and self._is_subtitle_line(stripped_text, font_size, color, page_num):
                             # Mark as subtitle for later processing
                             line_data['is_subtitle'] = True
                             text_lines.append(line_data)
-                            self.logger.debug(f"📄 Subtitle line (page {page_num + 1}): '{line_text.strip()}' (size: {font_size:.1f})")
+                            if debug:
+                                self.logger.debug(f"📄 Subtitle line (page {page_num + 1}): '{stripped_text}' (size: {font_size:.1f})")
 
-                        elif self._is_capo_line(line_text, font_size, color, page_num):
+                        elif self._is_capo_line(stripped_text, font_size, color, page_num):
                             # Mark as capo for later processing
                             line_data['is_capo'] = True
                             text_lines.append(line_data)
-                            self.logger.debug(f"🎸 Capo line (page {page_num + 1}): '{line_text.strip()}' (size: {font_size:.1f})")
+                            if debug:
+                                self.logger.debug(f"🎸 Capo line (page {page_num + 1}): '{stripped_text}' (size: {font_size:.1f})")
 
                         
-                        elif self._is_kapodaster_line(line_text, is_pink):
+                        elif self._is_kapodaster_line(stripped_text, is_pink):
                             kapodaster_lines.append(line_data)
-                            self.logger.debug(f"🎸 Kapodaster line (page {page_num + 1}): '{line_text.strip()}' (pink: {is_pink}, size: {font_size:.1f})")
+                            if debug:
+                                self.logger.debug(f"🎸 Kapodaster line (page {page_num + 1}): '{stripped_text}' (pink: {is_pink}, size: {font_size:.1f})")
                         
-                        elif self._is_comment_line(line_text, is_pink):
+                        elif self._is_comment_line(stripped_text, is_pink):
                             comment_lines.append(line_data)
-                            self.logger.debug(f"💬 Comment line (page {page_num + 1}): '{line_text.strip()}' (pink: {is_pink}, size: {font_size:.1f})")
+                            if debug:
+                                self.logger.debug(f"💬 Comment line (page {page_num + 1}): '{stripped_text}' (pink: {is_pink}, size: {font_size:.1f})")
                         
                         # Check for Italian role lines using language-specific detection
-                        elif (self.config.language_code == "it" and
-                              hasattr(self.config, 'is_role_line') and
-                              self.config.is_role_line(line_text, font_size, is_bold, color)):
+                        # (bold is detected from the font name only when a role check needs it)
+                        elif (italian_role_line is not None and
+                              italian_role_line(line_text, font_size, self._is_bold_font(font_name), color)):
                             # Italian role line detected - deactivate subtitle detection
                             if not found_first_role:
                                 found_first_role = True
@@ -197,7 +288,8 @@ class ImprovedPDFExtractor:
                                 self.logger.debug(f"🎭 First role detected - subtitle detection deactivated")
                             line_data['is_role'] = True
                             text_lines.append(line_data)
-                            self.logger.debug(f"🎭 Role line (page {page_num + 1}): '{line_text.strip()}' (size: {font_size:.1f})")
+                            if debug:
+                                self.logger.debug(f"🎭 Role line (page {page_num + 1}): '{stripped_text}' (size: {font_size:.1f})")
 
                         else:
                             # Regular text line (verses, role markers for other languages)
@@ -212,24 +304,25 @@ class ImprovedPDFExtractor:
                                     self.logger.debug(f"🎭 First role detected - subtitle detection deactivated")
 
                                 # Extract text content after role marker
-                                for role in sorted(self.config.role_markers, key=len, reverse=True):
-                                    if line_text.strip().startswith(role):
+                                for role in self.role_markers_by_length:
+                                    if stripped_text.startswith(role):
                                         text_after_role = line_text[len(role):].strip()
                                         if text_after_role:
                                             line_data['text_content'] = text_after_role
                                         break
 
                             text_lines.append(line_data)
-                            role_info = " (with role)" if has_role_marker else ""
 
                             # Enhanced debug for Spanish
-                            if self.config.language_code == "es":
-                                caps_info = f", ALL_CAPS: {line_text.strip().isupper()}"
-                                color_info = f", pink: {is_pink}"
-                                self.logger.debug(f"📝 Text line{role_info} (page {page_num + 1}): '{line_text.strip()[:50]}...' (size: {font_size:.1f}{caps_info}{color_info})")
-
-                            else:
-                                self.logger.debug(f"📝 Text line{role_info} (page {page_num + 1}): '{line_text.strip()[:50]}...' (size: {font_size:.1f})")
+                            if debug:
+                                role_info = " (with role)" if has_role_marker else ""
+                                if is_spanish:
+                                    caps_info = f", ALL_CAPS: {stripped_text.isupper()}"
+                                    color_info = f", pink: {is_pink}"
+                                    self.logger.debug(f"📝 Text line{role_info} (page {page_num + 1}): '{stripped_text[:50]}...' (size: {font_size:.1f}{caps_info}{color_info})")
+
+                                else:
+                                    self.logger.debug(f"📝 Text line{role_info} (page {page_num + 1}): '{stripped_text[:50]}...' (size: {font_size:.1f})")
         
         doc.close()
         
@@ -240,7 +333,7 @@ class ImprovedPDFExtractor:
         # This allows for more precise control over different quote formats
 
         # Spanish-specific: Combine text lines separated by chord chain spacing
-        if self.config.language_code == "es":
+        if is_spanish:
             text_lines = self._combine_spanish_chord_spaced_lines(text_lines)
 
         result = {
@@ -378,36 +471,20 @@ class ImprovedPDFExtractor:
             if len(words) == 1 and self._looks_like_italian_chord(words[0]):
                 return True
 
-            # Handle multiple Italian chords using chord unit parsing
-            # Use the same logic as chord sequence detection to properly parse chord units
-            chord_units = []
+            # Handle multiple Italian chords using chord unit parsing: a chord root,
+            # optionally followed by one extension word ("La m", "Mi 7")
+            chord_unit_count = 0
             i = 0
             while i < len(words):
-                if i < len(words) - 1:
-                    # Check for two-word chord units like "La m", "Mi 7"
-                    two_word_unit = f"{words[i]} {words[i + 1]}"
-                    if self._looks_like_italian_chord_unit(two_word_unit):
-                        chord_units.append(two_word_unit)
-                        i += 2  # Skip both words
-                        continue
-
-                if i < len(words) - 2:
-                    # Check for three-word chord units like "Fa maj 7"
-                    three_word_unit = f"{words[i]} {words[i + 1]} {words[i + 2]}"
-                    if self._looks_like_italian_chord_unit(three_word_unit):
-                        chord_units.append(three_word_unit)
-                        i += 3  # Skip all three words
-                        continue
-
-                # Check for single-word chord
                 if self._looks_like_italian_chord(words[i]):
-                    chord_units.append(words[i])
-
+                    chord_unit_count += 1
+                    if i + 1 < len(words) and self._is_italian_chord_extension(words[i + 1]):
+                        i += 1  # The extension belongs to this chord unit
                 i += 1
 
             # If most units are chord units, it's a chord line
-            if len(words) > 0 and len(chord_units) > 0:
-                chord_ratio = len(chord_units) / len(words)
+            if chord_unit_count > 0:
+                chord_ratio = chord_unit_count / len(words)
                 # Use a lower threshold since we're counting chord units properly
                 if chord_ratio > 0.5:
                     return True
@@ -416,7 +493,7 @@ class ImprovedPDFExtractor:
         # Special case: single spaced chord like "H 7" should be recognized as chord line
         if len(words) == 2:
             normalized_single_chord = self._normalize_chord(' '.join(words))
-            if normalized_single_chord in self.config.valid_chords:
+            if normalized_single_chord in self.valid_chords:
                 return True
 
         chord_count = 0
@@ -429,9 +506,7 @@ class ImprovedPDFExtractor:
     def _normalize_chord(self, chord_text: str) -> str:
         """Normalize chord text by removing spaces between chord and number"""
         # Handle spaced numbered chords like "H 7" -> "H7"
-        import re
-        # Match chord letter(s) followed by space and number
-        normalized = re.sub(r'([A-H][a-z]*)\s+(\d+)', r'\1\2', chord_text)
+        normalized = self.spaced_chord_pattern.sub(r'\1\2', chord_text)
         return normalized
 
     def _looks_like_spanish_chord(self, word: str) -> bool:
@@ -445,47 +520,41 @@ class ImprovedPDFExtractor:
             return all(self._looks_like_spanish_chord(part) for part in pipe_parts if part)
 
         # Check against Spanish chord list from config
-        if hasattr(self.config, 'chord_letters') and word_clean in self.config.chord_letters:
+        if word_clean in self.chord_letters:
             return True
 
-        # Common Spanish chord patterns
-        spanish_chord_patterns = [
-            r'^(DO|Do|Re|Mi|Fa|Sol|La|Si)([#b]?)([–\-]?)(\d*)$',  # Basic Spanish chords
-            r'^(DO|Do|Re|Mi|Fa|Sol|La|Si)([#b]?)([–\-]?)(7|6|9|maj7|dim|aum)$',  # With extensions
-        ]
-
-        import re
-        for pattern in spanish_chord_patterns:
-            if re.match(pattern, word_clean):
-                return True
-
-        return False
+        # Common Spanish chord patterns (basic chords and chords with extensions)
+        return self.spanish_chord_pattern.match(word_clean) is not None
 
     def _looks_like_chord(self, word: str) -> bool:
         """Check if a word looks like a chord"""
+        valid_chords = self.valid_chords
+        normalize_chord = self._normalize_chord
+
         # First normalize the word (handle "H 7" -> "H7")
-        normalized_word = self._normalize_chord(word)
+        normalized_word = normalize_chord(word)
 
-        if normalized_word in self.config.valid_chords:
+        if normalized_word in valid_chords:
             return True
 
         # Check for compound chords
         if ' ' in word:
             parts = word.split()
-            return any(self._normalize_chord(part) in self.config.valid_chords for part in parts)
-
-        if len(word) > 1:
-            for i in range(1, len(word)):
-                left_part = word[:i]
-                right_part = word[i:]
-                if (self._normalize_chord(left_part) in self.config.valid_chords and
-                    self._normalize_chord(right_part) in self.config.valid_chords):
-                    return True
+            return any(normalize_chord(part) in valid_chords for part in parts)
+
+        # Check for two chords written together (e.g. "CAmaj7")
+        if word[:1] not in self.chord_initials:
+            return False
+        for i in range(1, len(word)):
+            if (normalize_chord(word[:i]) in valid_chords and
+                normalize_chord(word[i:]) in valid_chords):
+                return True
 
         return False
     
     def _is_title_line(self, text: str, font_size: float, is_pink: bool, color: int = 0) -> bool:
         """Check if line is a title based on content, font size, and color"""
+        debug = self.logger.isEnabledFor(logging.DEBUG)
         text_clean = text.strip()
 
         # Italian-specific title detection
@@ -499,40 +568,18 @@ class ImprovedPDFExtractor:
             is_reasonable_length = len(text_clean) >= 5  # Allow titles with 5+ characters
 
             # Debug Italian title detection
-            self.logger.debug(f"🔍 Italian title check: '{text_clean[:30]}...' | "
-                            f"font_size: {font_size:.1f} (req: ~14.9) | "
-                            f"color: {color} (req: 14355506 or 13768500) | is_red: {is_red} | "
-                            f"is_uppercase: {is_uppercase} | len: {len(text_clean)}")
+            if debug:
+                self.logger.debug(f"🔍 Italian title check: '{text_clean[:30]}...' | "
+                                f"font_size: {font_size:.1f} (req: ~14.9) | "
+                                f"color: {color} (req: 14355506 or 13768500) | is_red: {is_red} | "
+                                f"is_uppercase: {is_uppercase} | len: {len(text_clean)}")
 
             result = is_red and is_large and is_uppercase and is_reasonable_length
-            self.logger.debug(f"🔍 Italian title result: {result} for '{text_clean[:30]}...'")
+            if debug:
+                self.logger.debug(f"🔍 Italian title result: {result} for '{text_clean[:30]}...'")
             return result
 
         # Enhanced title detection for other languages
-        import re
-
-        # Remove biblical references and parentheses content for uppercase check
-        # Handle various formats:
-        # - "TITLE - Ps 83 (84)"
-        # - "TITLE - Tobijev hvalospev (Tob 13) *"
-        # - "TITLE - Mt 5,1-12"
-        text_for_case_check = re.sub(r'\s*-\s*[A-Za-z][^(]*(\([^)]*\))?[^A-Z]*$', '', text_clean)
-        text_for_case_check = re.sub(r'\([^)]*\)', '', text_for_case_check).strip()
-
-        # Check if the main part is mostly uppercase
-        if text_for_case_check:
-            uppercase_chars = sum(1 for c in text_for_case_check if c.isupper())
-            lowercase_chars = sum(1 for c in text_for_case_check if c.islower())
-            total_letters = uppercase_chars + lowercase_chars
-
-            if total_letters > 0:
-                uppercase_ratio = uppercase_chars / total_letters
-                is_mostly_uppercase = uppercase_ratio >= 0.7  # At least 70% uppercase
-            else:
-                is_mostly_uppercase = True  # No letters, consider as valid
-        else:
-            is_mostly_uppercase = text_clean.isupper()
-
         # Title criteria: mostly uppercase, reasonable length, larger font
         # Language-specific color requirements:
         # - Croatian: Pink color required (is_pink)
@@ -553,14 +600,49 @@ class ImprovedPDFExtractor:
             color_requirement = is_red  # Spanish titles are pure red, not pink
             font_size_requirement = 15.0  # Spanish titles are much larger
 
-            # Debug Spanish title detection
+        # Most lines fail the cheap length, font size and color checks, so
+        # reject them before the uppercase analysis
+        if len(text_clean) <= 4 or font_size < font_size_requirement or not color_requirement:
+            if debug:
+                self.logger.debug(f"🔍 Title check skipped: '{text_clean[:30]}...' | "
+                                f"font_size: {font_size:.1f} (req: {font_size_requirement}) | "
+                                f"color_req: {color_requirement} | len: {len(text_clean)}")
+            return False
+
+        # Remove biblical references and parentheses content for uppercase check
+        # Handle various formats:
+        # - "TITLE - Ps 83 (84)"
+        # - "TITLE - Tobijev hvalospev (Tob 13) *"
+        # - "TITLE - Mt 5,1-12"
+        text_for_case_check = self.title_reference_pattern.sub('', text_clean)
+        text_for_case_check = self.parentheses_pattern.sub('', text_for_case_check).strip()
+
+        # Check if the main part is mostly uppercase
+        if text_for_case_check.isupper():
+            # Every cased letter is uppercase (the usual title), no need to count
+            is_mostly_uppercase = True
+        elif text_for_case_check:
+            uppercase_chars = sum(1 for c in text_for_case_check if c.isupper())
+            lowercase_chars = sum(1 for c in text_for_case_check if c.islower())
+            total_letters = uppercase_chars + lowercase_chars
+
+            if total_letters > 0:
+                uppercase_ratio = uppercase_chars / total_letters
+                is_mostly_uppercase = uppercase_ratio >= 0.7  # At least 70% uppercase
+            else:
+                is_mostly_uppercase = True  # No letters, consider as valid
+        else:
+            is_mostly_uppercase = text_clean.isupper()
+
+        # Debug Spanish title detection
+        if debug and self.config.language_code == "es":
             self.logger.debug(f"🔍 Spanish title check: '{text_clean[:30]}...' | "
                             f"font_size: {font_size:.1f} (req: {font_size_requirement}) | "
                             f"is_red: {is_red} | is_pink: {is_pink} | uppercase: {is_mostly_uppercase} | "
                             f"len: {len(text_clean)}")
 
         # Debug Croatian title detection
-        if self.config.language_code == "hr":
+        if debug and self.config.language_code == "hr":
             role_check = any(role in text_clean for role in self.config.role_markers)
             chord_check = self._is_chord_line_text(text_clean)
             self.logger.debug(f"🔍 Croatian title check: '{text_clean[:50]}...' | "
@@ -573,22 +655,21 @@ class ImprovedPDFExtractor:
                 self.logger.debug(f"🔍 Matching roles found: {matching_roles}")
 
         is_title = (is_mostly_uppercase and
-                   len(text_clean) > 4 and
-                   font_size >= font_size_requirement and
-                   color_requirement and
                    not any(role in text_clean for role in self.config.role_markers) and
-                   not self._is_chord_line_text(text_clean) and
-                   'kapodaster' not in text_clean.lower() and
-                   'cejilla' not in text_clean.lower())  # Spanish capodaster term
+                   not self._is_chord_line_text(text_clean))
+        if is_title:
+            text_lower = text_clean.lower()
+            is_title = 'kapodaster' not in text_lower and 'cejilla' not in text_lower  # Spanish capodaster term
 
         # Debug output for Spanish
-        if self.config.language_code == "es":
+        if debug and self.config.language_code == "es":
             self.logger.debug(f"🔍 Spanish title result: {is_title} for '{text_clean[:30]}...'")
 
         return is_title
 
     def _is_subtitle_line(self, text: str, font_size: float, color: int, page_num: int) -> bool:
         """Check if a line is a subtitle (usually biblical references)"""
+        debug = self.logger.isEnabledFor(logging.DEBUG)
         text_clean = text.strip()
 
         if not text_clean or len(text_clean) < 3:
@@ -600,36 +681,41 @@ class ImprovedPDFExtractor:
             is_subtitle_size = abs(font_size - 9.8) < 1.0   # Subtitle size
             is_reasonable_length = 3 <= len(text_clean) <= 100
 
+            # Reject other sizes and lengths before the chord and marker checks
+            if not (is_subtitle_size and is_reasonable_length):
+                if debug:
+                    self.logger.debug(f"🔍 Italian subtitle check skipped: '{text_clean[:30]}...' | "
+                                    f"font_size: {font_size:.1f} (req: ~9.8) | len: {len(text_clean)}")
+                return False
+
             # Check if this looks like a chord sequence first
             is_chord_sequence = self._looks_like_italian_chord_sequence(text_clean)
 
             # Debug chord sequence detection
-            self.logger.debug(f"🎸 Chord sequence check: '{text_clean}' -> is_chord_sequence: {is_chord_sequence}")
+            if debug:
+                self.logger.debug(f"🎸 Chord sequence check: '{text_clean}' -> is_chord_sequence: {is_chord_sequence}")
 
             # Common Italian subtitle patterns (only if not a chord sequence)
             is_biblical_ref = False
             if not is_chord_sequence:
-                is_biblical_ref = any(pattern in text_clean.lower() for pattern in [
-                    'cfr.', 'gen ', 'mt ', 'mc ', 'lc ', 'gv ', 'at ', 'rm ', 'cor ', 'gal ', 'ef ', 'fil ', 'col ',
-                    'ts ', 'tm ', 'tt ', 'fm ', 'eb ', 'gc ', 'pt ', 'gv ', 'ap ', 'sal ', 'is ', 'ger ', 'ez ',
-                    'dn ', 'os ', 'gl ', 'am ', 'ab ', 'gn ', 'mi ', 'na ', 'ab ', 'so ', 'ag ', 'zc ', 'ml ',
-                    'tempo di', 'quaresima', 'avvento', 'pasqua', 'natale', 'ordinario'
-                ])
+                is_biblical_ref = self.italian_subtitle_pattern.search(text_clean.lower()) is not None
 
             # Debug Italian subtitle detection
-            self.logger.debug(f"🔍 Italian subtitle check: '{text_clean[:30]}...' | "
-                            f"font_size: {font_size:.1f} (req: ~9.8) | "
-                            f"is_subtitle_size: {is_subtitle_size} | "
-                            f"is_biblical_ref: {is_biblical_ref} | len: {len(text_clean)}")
-
-            result = is_subtitle_size and is_reasonable_length and is_biblical_ref
-            self.logger.debug(f"🔍 Italian subtitle result: {result} for '{text_clean[:30]}...'")
+            if debug:
+                self.logger.debug(f"🔍 Italian subtitle check: '{text_clean[:30]}...' | "
+                                f"font_size: {font_size:.1f} (req: ~9.8) | "
+                                f"is_biblical_ref: {is_biblical_ref} | len: {len(text_clean)}")
+
+            result = is_biblical_ref
+            if debug:
+                self.logger.debug(f"🔍 Italian subtitle result: {result} for '{text_clean[:30]}...'")
             return result
 
         return False
 
     def _is_capo_line(self, text: str, font_size: float, color: int, page_num: int) -> bool:
         """Check if a line is a capo instruction"""
+        debug = self.logger.isEnabledFor(logging.DEBUG)
         text_clean = text.strip()
 
         if not text_clean or len(text_clean) < 3:
@@ -639,25 +725,20 @@ class ImprovedPDFExtractor:
         if self.config.language_code == "it":
             text_lower = text_clean.lower()
 
-            # Italian capo patterns: "Barrè al III tasto", "Barrè al II tasto", etc.
-            italian_capo_patterns = [
-                'barrè al', 'barre al', 'capotasto al', 'capo al'
-            ]
-
             # Check if text contains any Italian capo patterns
-            is_capo_instruction = any(pattern in text_lower for pattern in italian_capo_patterns)
+            is_capo_instruction = any(pattern in text_lower for pattern in self.italian_capo_patterns)
 
             # Check for Roman numerals or numbers
-            import re
-            has_fret_number = bool(re.search(r'\b(i{1,3}|iv|v|vi{0,3}|ix|x|\d+)\s*(tasto|fret)\b', text_lower))
+            has_fret_number = bool(self.capo_fret_pattern.search(text_lower))
 
             # Debug Italian capo detection
-            self.logger.debug(f"🔍 Italian capo check: '{text_clean[:30]}...' | "
-                            f"is_capo: {is_capo_instruction} | has_fret: {has_fret_number}")
+            if debug:
+                self.logger.debug(f"🔍 Italian capo check: '{text_clean[:30]}...' | "
+                                f"is_capo: {is_capo_instruction} | has_fret: {has_fret_number}")
 
             result = is_capo_instruction and has_fret_number
 
-            if result:
+            if debug and result:
                 self.logger.debug(f"🔍 Italian capo detected: '{text_clean[:30]}...'")
 
             return result
@@ -666,9 +747,10 @@ class ImprovedPDFExtractor:
 
     def _is_kapodaster_line(self, text: str, is_pink: bool) -> bool:
         """Check if line is kapodaster based on content and color"""
+        if not is_pink:
+            return False
         text_lower = text.strip().lower()
-        return (is_pink and
-                ('kapodaster' in text_lower or 'kapo' in text_lower))
+        return 'kapodaster' in text_lower or 'kapo' in text_lower
     
     def _is_comment_line(self, text: str, is_pink: bool) -> bool:
         """Enhanced comment detection based on content and color"""
@@ -691,32 +773,55 @@ class ImprovedPDFExtractor:
             return True
         
         # Starts with * or ** (usually under horizontal line)
-        if text_clean.startswith('*') and ('zbor' in text_clean.lower() or 'odgovara' in text_clean.lower()):
-            return True
+        if text_clean.startswith('*'):
+            text_lower = text_clean.lower()
+            if 'zbor' in text_lower or 'odgovara' in text_lower:
+                return True
         
         return False
     
-    def _combine_chord_lines_by_y_position(self, chord_lines: List[Dict]) -> List[Dict]:
-        """Combine chord lines that are on the same Y position into single chord lines"""
-        if not chord_lines:
-            return []
+    def _group_lines_by_y(self, lines: List[Dict], tolerance: float) -> Dict[float, List[Dict]]:
+        """
+        Group lines whose Y position is within tolerance of a group's first line.
         
-        # Group chord lines by Y position (with small tolerance for floating point differences)
+        Each line joins the earliest created group within tolerance, so group
+        Y positions are always at least `tolerance` apart and only the groups
+        next to a line's Y position in sorted order can match it.
+        
+        Returns:
+            Dictionary of group Y position -> lines, in group creation order
+        """
         y_groups = {}
-        for chord_line in chord_lines:
-            y_pos = chord_line['y']
+        group_order = {}  # group Y position -> creation index
+        sorted_group_ys = []
+        
+        for line in lines:
+            y_pos = line['y']
             
-            # Find existing group with similar Y position (within 1 pixel tolerance)
+            # Check the neighbouring groups (one extra on each side for float rounding)
             found_group = None
-            for existing_y in y_groups.keys():
-                if abs(y_pos - existing_y) < 1.0:
+            start = bisect_left(sorted_group_ys, y_pos - tolerance)
+            for existing_y in sorted_group_ys[max(start - 1, 0):start + 3]:
+                if (abs(y_pos - existing_y) < tolerance and
+                        (found_group is None or group_order[existing_y] < group_order[found_group])):
                     found_group = existing_y
-                    break
             
             if found_group is not None:
-                y_groups[found_group].append(chord_line)
+                y_groups[found_group].append(line)
             else:
-                y_groups[y_pos] = [chord_line]
+                group_order[y_pos] = len(group_order)
+                y_groups[y_pos] = [line]
+                sorted_group_ys.insert(bisect_left(sorted_group_ys, y_pos), y_pos)
+        
+        return y_groups
+    
+    def _combine_chord_lines_by_y_position(self, chord_lines: List[Dict]) -> List[Dict]:
+        """Combine chord lines that are on the same Y position into single chord lines"""
+        if not chord_lines:
+            return []
+        
+        # Group chord lines by Y position (within 1 pixel tolerance for floating point differences)
+        y_groups = self._group_lines_by_y(chord_lines, 1.0)
         
         # Combine chord lines in each Y group
         combined_lines = []
@@ -738,22 +843,8 @@ class ImprovedPDFExtractor:
 
 
 
-        # Group text lines by Y position (with small tolerance)
-        y_groups = {}
-        for i, text_line in enumerate(text_lines):
-            y_pos = text_line['y']
-
-            # Find existing group with similar Y position (within 5 pixels tolerance for Spanish)
-            found_group = None
-            for existing_y in y_groups.keys():
-                if abs(y_pos - existing_y) < 5.0:  # Larger tolerance for Spanish chord spacing
-                    found_group = existing_y
-                    break
-
-            if found_group is not None:
-                y_groups[found_group].append(text_line)
-            else:
-                y_groups[y_pos] = [text_line]
+        # Group text lines by Y position (within 5 pixels, a larger tolerance for Spanish chord spacing)
+        y_groups = self._group_lines_by_y(text_lines, 5.0)
 
         # Process each Y group to combine chord-spaced lines
         combined_lines = []
@@ -851,24 +942,11 @@ class ImprovedPDFExtractor:
         if not text_lines:
             return []
 
-        # Group text lines by Y position (with small tolerance)
-        y_groups = {}
-        for text_line in text_lines:
-            y_pos = text_line['y']
-
-            # Find existing group with similar Y position (within 1 pixel tolerance)
-            found_group = None
-            for existing_y in y_groups.keys():
-                if abs(y_pos - existing_y) < 1.0:
-                    found_group = existing_y
-                    break
-
-            if found_group is not None:
-                y_groups[found_group].append(text_line)
-            else:
-                y_groups[y_pos] = [text_line]
+        # Group text lines by Y position (within 1 pixel tolerance)
+        y_groups = self._group_lines_by_y(text_lines, 1.0)
 
         # Process each Y group to combine quote marks
+        debug = self.logger.isEnabledFor(logging.DEBUG)
         combined_lines = []
         for y_pos, group_lines in y_groups.items():
             if len(group_lines) == 1:
@@ -879,7 +957,8 @@ class ImprovedPDFExtractor:
                 combined_line = self._merge_quote_marks_at_same_y(group_lines, y_pos)
                 if combined_line:
                     combined_lines.append(combined_line)
-                    self.logger.debug(f"📝 Combined quote line at Y={y_pos:.1f}: '{combined_line['text'].strip()}'")
+                    if debug:
+                        self.logger.debug(f"📝 Combined quote line at Y={y_pos:.1f}: '{combined_line['text'].strip()}'")
                 else:
                     # If no combining needed, add all lines individually
                     combined_lines.extend(group_lines)
@@ -944,12 +1023,13 @@ class ImprovedPDFExtractor:
 
             # Use the position of the first quote mark
             first_quote = quote_marks[0]
+            max_x = max(line['x_end'] for line in sorted_lines)
             return {
                 'text': combined_text,
                 'text_content': actual_text,  # Store clean text content
                 'x_start': first_quote['x_start'],
-                'x_end': max(line['x_end'] for line in sorted_lines),
-                'width': max(line['x_end'] for line in sorted_lines) - first_quote['x_start'],
+                'x_end': max_x,
+                'width': max_x - first_quote['x_start'],
                 'y': y_pos,
                 'font_size': first_quote['font_size'],
                 'color': first_quote.get('color', 0),
@@ -964,6 +1044,7 @@ class ImprovedPDFExtractor:
 
     def find_chord_positions_in_span(self, chord_span_text: str, chord_span_start: float, chord_span_width: float) -> List[Tuple[str, float]]:
         """Find individual chord positions within the chord span - enhanced for Spanish spaced chords"""
+        debug = self.logger.isEnabledFor(logging.DEBUG)
         chord_positions = []
 
         # Spanish-specific handling for spaced chord extensions
@@ -981,6 +1062,8 @@ class ImprovedPDFExtractor:
         words = normalized_chord_text.split()
         current_pos = 0
 
+        text_length = len(chord_span_text)
+
         for word in words:
             if self._looks_like_chord(word):
                 # We need to map back to the original text position
@@ -990,21 +1073,21 @@ class ImprovedPDFExtractor:
                 if word_start_in_text == -1:
                     # Handle case where normalized chord (e.g., "H7") doesn't exist in original ("H 7")
                     # Look for the base chord letter(s) in the original text
-                    import re
-                    base_chord = re.match(r'([A-H][a-z]*)', word)
+                    base_chord = self.chord_root_pattern.match(word)
                     if base_chord:
                         base_chord_text = base_chord.group(1)
                         word_start_in_text = chord_span_text.find(base_chord_text, current_pos)
 
                 if word_start_in_text != -1:
                     # Calculate proportional position within the span
-                    proportional_pos = word_start_in_text / len(chord_span_text) if len(chord_span_text) > 0 else 0
+                    proportional_pos = word_start_in_text / text_length
                     pixel_pos = chord_span_start + (proportional_pos * chord_span_width)
 
                     # Use the normalized chord name for output
                     normalized_word = self._normalize_chord(word)
                     chord_positions.append((normalized_word, pixel_pos))
-                    self.logger.debug(f"      🎸 Found chord '{normalized_word}' (from '{word}') at text_pos={word_start_in_text}, pixel_x={pixel_pos:.1f}")
+                    if debug:
+                        self.logger.debug(f"      🎸 Found chord '{normalized_word}' (from '{word}') at text_pos={word_start_in_text}, pixel_x={pixel_pos:.1f}")
 
                     current_pos = word_start_in_text + len(word)
 
@@ -1012,6 +1095,7 @@ class ImprovedPDFExtractor:
 
     def _find_spanish_chord_positions(self, chord_span_text: str, chord_span_start: float, chord_span_width: float) -> List[Tuple[str, float]]:
         """Find Spanish chord positions, handling spaced extensions and chord chains"""
+        debug = self.logger.isEnabledFor(logging.DEBUG)
         chord_positions = []
         text = chord_span_text.strip()
 
@@ -1025,20 +1109,17 @@ class ImprovedPDFExtractor:
             pixel_pos = chord_span_start
 
             chord_positions.append((text, pixel_pos))
-            self.logger.debug(f"      🎸 Spanish chord chain '{text}' at pixel_x={pixel_pos:.1f}")
+            if debug:
+                self.logger.debug(f"      🎸 Spanish chord chain '{text}' at pixel_x={pixel_pos:.1f}")
             return chord_positions
 
         # Handle spaced chord extensions (e.g., "Mi– 6", "Re– 9")
-        import re
-
-        # Pattern for Spanish chord with optional spaced extension
         # Matches: Mi–, Mi– 6, Re–, Re– 9, Sol7, La, etc.
-        spanish_chord_pattern = r'((?:DO|Do|Re|Mi|Fa|Sol|La|Si)(?:[#b]?)(?:[–\-]?))\s*(\d+|maj7|dim|aum)?'
-
         current_pos = 0
+        text_length = len(text)
 
         # Find all chord matches in the text
-        for match in re.finditer(spanish_chord_pattern, text):
+        for match in self.spanish_chord_span_pattern.finditer(text):
             base_chord = match.group(1)  # e.g., "Mi–"
             extension = match.group(2)   # e.g., "6"
 
@@ -1057,12 +1138,13 @@ class ImprovedPDFExtractor:
                 match_start = match.start()
 
                 # Calculate proportional position within the span
-                proportional_pos = match_start / len(text) if len(text) > 0 else 0
+                proportional_pos = match_start / text_length
                 pixel_pos = chord_span_start + (proportional_pos * chord_span_width)
 
                 # Use the full chord name (with extension)
                 chord_positions.append((full_chord, pixel_pos))
-                self.logger.debug(f"      🎸 Spanish chord '{full_chord}' (normalized: '{normalized_chord}') at text_pos={match_start}, pixel_x={pixel_pos:.1f}")
+                if debug:
+                    self.logger.debug(f"      🎸 Spanish chord '{full_chord}' (normalized: '{normalized_chord}') at text_pos={match_start}, pixel_x={pixel_pos:.1f}")
 
         # If no Spanish chord patterns found, fall back to word-by-word analysis
         if not chord_positions:
@@ -1087,11 +1169,12 @@ class ImprovedPDFExtractor:
                     # Find position in original text
                     word_start = text.find(word, current_pos)
                     if word_start != -1:
-                        proportional_pos = word_start / len(text) if len(text) > 0 else 0
+                        proportional_pos = word_start / text_length
                         pixel_pos = chord_span_start + (proportional_pos * chord_span_width)
 
                         chord_positions.append((full_chord, pixel_pos))
-                        self.logger.debug(f"      🎸 Spanish chord '{full_chord}' at text_pos={word_start}, pixel_x={pixel_pos:.1f}")
+                        if debug:
+                            self.logger.debug(f"      🎸 Spanish chord '{full_chord}' at text_pos={word_start}, pixel_x={pixel_pos:.1f}")
 
                         current_pos = word_start + len(full_chord)
 
@@ -1102,6 +1185,7 @@ class ImprovedPDFExtractor:
     def map_chord_to_verse_position(self, chord_pixel_x: float, chord_span_start: float, chord_span_width: float,
                                    verse_text: str, verse_span_start: float, verse_span_width: float, font_size: float) -> int:
         """Map chord pixel position to verse character position using direct pixel mapping"""
+        debug = self.logger.isEnabledFor(logging.DEBUG)
 
         # Map chord position directly to verse span, not via chord span proportions
         # Calculate proportional position of chord within the verse span
@@ -1117,16 +1201,18 @@ class ImprovedPDFExtractor:
         # The target pixel position is the clamped chord position
         verse_pixel_x = chord_x_clamped
 
-        self.logger.debug(f"      🎯 Chord at x={chord_pixel_x:.1f} -> clamped_x={chord_x_clamped:.1f} -> proportion={proportional_pos:.3f}")
+        if debug:
+            self.logger.debug(f"      🎯 Chord at x={chord_pixel_x:.1f} -> clamped_x={chord_x_clamped:.1f} -> proportion={proportional_pos:.3f}")
 
         # Convert verse pixel position to character position using language-specific font metrics
         current_pixel = verse_span_start
         char_position = 0
+        char_widths, default_char_width = self._char_widths_at_size(font_size)
 
         for i, char in enumerate(verse_text):
             # Use Arial font metrics for precise character-by-character width calculation
             # This provides the most accurate positioning regardless of language
-            char_width = self.get_char_width(char, font_size)
+            char_width = char_widths.get(char, default_char_width)
 
             char_center = current_pixel + (char_width / 2)
 
@@ -1140,8 +1226,9 @@ class ImprovedPDFExtractor:
         # Ensure position is within bounds
         char_position = max(0, min(char_position, len(verse_text)))
 
-        char_at_pos = verse_text[char_position] if char_position < len(verse_text) else 'END'
-        self.logger.debug(f"      📍 Mapped to char_pos={char_position} ('{char_at_pos}') using {'language-specific' if hasattr(self.config, 'get_character_width') else 'Arial'} metrics")
+        if debug:
+            char_at_pos = verse_text[char_position] if char_position < len(verse_text) else 'END'
+            self.logger.debug(f"      📍 Mapped to char_pos={char_position} ('{char_at_pos}') using {'language-specific' if hasattr(self.config, 'get_character_width') else 'Arial'} metrics")
 
         return char_position
     
@@ -1150,20 +1237,25 @@ class ImprovedPDFExtractor:
         # Sort by X position
         sorted_lines = sorted(chord_lines, key=lambda x: x['x_start'])
         
-        # Find the overall bounding box
-        min_x = min(line['x_start'] for line in sorted_lines)
-        max_x = max(line['x_end'] for line in sorted_lines)
+        # The lines are sorted, so the bounding box starts at the first one;
+        # its end is tracked while the text is assembled
+        min_x = sorted_lines[0]['x_start']
+        max_x = sorted_lines[0]['x_end']
         
         # Create combined text by positioning each chord at its correct X position
-        combined_text = ""
+        text_parts = []
         current_x = min_x
         
         for line in sorted_lines:
             # Add spaces to reach the chord position
             spaces_needed = max(0, int((line['x_start'] - current_x) / 6))  # Approximate character width
-            combined_text += " " * spaces_needed
-            combined_text += line['text'].strip()
+            text_parts.append(" " * spaces_needed)
+            text_parts.append(line['text'].strip())
             current_x = line['x_end']
+            if current_x > max_x:
+                max_x = current_x
+        
+        combined_text = "".join(text_parts)
         
         # Create the combined chord line data
         return {
@@ -1186,38 +1278,38 @@ class ImprovedPDFExtractor:
             return False
 
         font_lower = font_name.lower()
-        bold_indicators = ['bold', 'black', 'heavy', 'semibold', 'demibold', 'extrabold']
-
-        return any(indicator in font_lower for indicator in bold_indicators)
+        return any(indicator in font_lower for indicator in self.bold_font_indicators)
 
     def _find_italian_chord_positions(self, chord_span_text: str, chord_span_start: float, chord_span_width: float) -> List[Tuple[str, float]]:
         """Find Italian chord positions, handling spaced extensions like 'La m', 'Re m 9', '(Sol 7)'"""
+        debug = self.logger.isEnabledFor(logging.DEBUG)
         chord_positions = []
         text = chord_span_text.strip()
 
         if not text:
             return chord_positions
 
+        text_length = len(text)
+
         # Handle chords in parentheses: "(Sol 7)" -> keep as single unit
         if text.startswith('(') and text.endswith(')'):
             # Treat entire parentheses content as one chord
             proportional_pos = 0  # Start at the beginning
             pixel_pos = chord_span_start
             chord_positions.append((text, pixel_pos))
-            self.logger.debug(f"      🎸 Italian parentheses chord '{text}' at pixel_x={pixel_pos:.1f}")
+            if debug:
+                self.logger.debug(f"      🎸 Italian parentheses chord '{text}' at pixel_x={pixel_pos:.1f}")
             return chord_positions
 
         # Handle multiple individual chords separated by spaces
         # For example: "La m Mi" should be treated as two separate chords
-        import re
 
         # Use a different approach: split by multiple spaces to identify chord units
         # This handles cases like "Fa maj 7                                            Mi"
         # where chords are separated by large spaces
 
         # Split by multiple spaces (4 or more) to separate chord units
-        import re
-        chord_units = re.split(r'\s{4,}', text)
+        chord_units = self.chord_unit_gap_pattern.split(text)
 
         # Track position in original text to handle duplicate chord names correctly
         current_pos = 0
@@ -1237,11 +1329,12 @@ class ImprovedPDFExtractor:
                     normalized_chord = self._normalize_merged_italian_chord_in_extractor(unit)
 
                     # Calculate proportional position within the span
-                    proportional_pos = unit_start / len(text) if len(text) > 0 else 0
+                    proportional_pos = unit_start / text_length
                     pixel_pos = chord_span_start + (proportional_pos * chord_span_width)
 
                     chord_positions.append((normalized_chord, pixel_pos))
-                    self.logger.debug(f"      🎸 Italian chord unit '{normalized_chord}' (from '{unit}') at text_pos={unit_start}, pixel_x={pixel_pos:.1f}")
+                    if debug:
+                        self.logger.debug(f"      🎸 Italian chord unit '{normalized_chord}' (from '{unit}') at text_pos={unit_start}, pixel_x={pixel_pos:.1f}")
 
                     # Update current_pos to search after this chord for the next one
                     current_pos = unit_start + len(unit)
@@ -1253,10 +1346,7 @@ class ImprovedPDFExtractor:
         # Fall back to regex approach for simpler cases
         # Pattern for Italian chord with optional spaced OR merged extension
         # Matches: "Re m", "Rem", "Re 7", "Re7", "Sol maj7", etc.
-        italian_chord_pattern = r'((?:Do|Re|Mi|Fa|Sol|La|Si)(?:[#b]?)(?:(?:\s+|)(?:[mb]|maj7|dim|aug|sus[24]|\d+))*)'
-
-        # Find all chord matches in the text
-        matches = list(re.finditer(italian_chord_pattern, text))
+        matches = list(self.italian_chord_span_pattern.finditer(text))
 
         if matches:
             for match in matches:
@@ -1273,11 +1363,12 @@ class ImprovedPDFExtractor:
                     normalized_chord = self._normalize_merged_italian_chord_in_extractor(full_chord_text)
 
                     # Calculate proportional position within the span
-                    proportional_pos = match_start / len(text) if len(text) > 0 else 0
+                    proportional_pos = match_start / text_length
                     pixel_pos = chord_span_start + (proportional_pos * chord_span_width)
 
                     chord_positions.append((normalized_chord, pixel_pos))
-                    self.logger.debug(f"      🎸 Italian chord '{normalized_chord}' (from '{full_chord_text}') at text_pos={match_start}, pixel_x={pixel_pos:.1f}")
+                    if debug:
+                        self.logger.debug(f"      🎸 Italian chord '{normalized_chord}' (from '{full_chord_text}') at text_pos={match_start}, pixel_x={pixel_pos:.1f}")
 
         # If regex approach didn't work, fall back to word-by-word analysis
         # This handles cases where chords are simple single words without extensions
@@ -1311,11 +1402,12 @@ class ImprovedPDFExtractor:
                         current_pos += len(word)
 
                     # Calculate proportional position within the span
-                    proportional_pos = chord_start_pos / len(text) if len(text) > 0 else 0
+                    proportional_pos = chord_start_pos / text_length
                     pixel_pos = chord_span_start + (proportional_pos * chord_span_width)
 
                     chord_positions.append((full_chord, pixel_pos))
-                    self.logger.debug(f"      🎸 Italian fallback chord '{full_chord}' (normalized from '{word}') at text_pos={chord_start_pos}, pixel_x={pixel_pos:.1f}")
+                    if debug:
+                        self.logger.debug(f"      🎸 Italian fallback chord '{full_chord}' (normalized from '{word}') at text_pos={chord_start_pos}, pixel_x={pixel_pos:.1f}")
                 else:
                     current_pos += len(word)
 
@@ -1334,28 +1426,23 @@ class ImprovedPDFExtractor:
 
         chord = chord.strip()
 
-        # Check for Italian chord roots
-        italian_roots = ['Do', 'Re', 'Mi', 'Fa', 'Sol', 'La', 'Si']
-
-        for root in italian_roots:
-            if chord.startswith(root):
-                remaining = chord[len(root):]
-                if not remaining:
-                    # Just the root chord
-                    return chord
-                elif remaining == 'm':
-                    # Already properly spaced
-                    return f"{root} m"
-                elif remaining.startswith('m') and len(remaining) > 1:
-                    # Merged minor chord with extension like "Rem9" -> "Re m 9"
-                    extension = remaining[1:]
-                    return f"{root} m {extension}"
-                elif remaining in ['7', '9', '6', '4', '2', '11', '13']:
-                    # Merged major chord with extension like "Re7" -> "Re 7"
-                    return f"{root} {remaining}"
-                elif remaining in ['maj7', 'dim', 'aug', 'sus4', 'sus2']:
-                    # Merged chord with complex extension
-                    return f"{root} {remaining}"
+        # Check for Italian chord roots (no root is a prefix of another)
+        match = self.italian_merged_chord_pattern.match(chord)
+        if match:
+            root, remaining = match.groups()
+            if not remaining:
+                # Just the root chord
+                return chord
+            elif remaining == 'm':
+                # Already properly spaced
+                return f"{root} m"
+            elif remaining.startswith('m'):
+                # Merged minor chord with extension like "Rem9" -> "Re m 9"
+                extension = remaining[1:]
+                return f"{root} m {extension}"
+            elif remaining in self.italian_merged_extensions:
+                # Merged major chord with extension like "Re7" -> "Re 7"
+                return f"{root} {remaining}"
 
         # If no normalization needed, return as-is
         return chord
@@ -1365,15 +1452,8 @@ class ImprovedPDFExtractor:
         if not text:
             return False
 
-        # Italian chord roots
-        italian_roots = ['Do', 'Re', 'Mi', 'Fa', 'Sol', 'La', 'Si']
-
         # Check for basic Italian chord pattern
-        for root in italian_roots:
-            if text.startswith(root):
-                return True
-
-        return False
+        return text.startswith(self.italian_chord_roots)
 
     def _looks_like_italian_chord_unit(self, text: str) -> bool:
         """Check if text looks like an Italian chord unit (including spaced extensions)"""
@@ -1395,23 +1475,18 @@ class ImprovedPDFExtractor:
             return True
 
         # Check for valid extensions in remaining words
-        valid_extensions = ['m', 'b', 'maj', 'min', 'dim', 'aug', 'add', 'sus4', 'sus2', '+', '°']
-        valid_numbers = ['6', '7', '9', '11', '13']
-
-        for word in words[1:]:
-            # Check if word is a valid extension or number
-            if word not in valid_extensions and word not in valid_numbers:
-                # Check if it's a number (for cases like "7", "9", etc.)
-                if not word.isdigit():
-                    return False
+        return all(self._is_italian_chord_extension(word) for word in words[1:])
 
-        return True
+    def _is_italian_chord_extension(self, word: str) -> bool:
+        """Check if word is an Italian chord extension ("m", "maj", "7", ...)"""
+        return word in self.italian_chord_extensions or word.isdigit()
 
     def _looks_like_italian_chord_sequence(self, text: str) -> bool:
         """
         Check if text looks like a sequence of Italian chords
         Examples: "Mi La m     Mi 7         La m", "Re m Fa Sol"
         """
+        debug = self.logger.isEnabledFor(logging.DEBUG)
         if not text:
             return False
 
@@ -1421,42 +1496,15 @@ class ImprovedPDFExtractor:
         if len(words) < 2:
             return False
 
-        # Try to parse chord units that may span multiple words
-        chord_units = []
-        i = 0
-        while i < len(words):
-            word = words[i]
-
-            # Check if current word is an Italian chord root
-            if self._looks_like_italian_chord(word):
-                chord_unit = word
-
-                # Check if next word(s) are chord extensions
-                if i + 1 < len(words):
-                    next_word = words[i + 1]
-                    # Check for extensions like "m", "7", "maj", "dim", etc.
-                    if next_word in ['m', 'b', 'maj', 'min', 'dim', 'aug', 'sus4', 'sus2', '+', '°'] or next_word.isdigit():
-                        chord_unit += f" {next_word}"
-                        i += 1
-
-                        # Check for three-part chords like "Fa maj 7"
-                        if i + 1 < len(words):
-                            third_word = words[i + 1]
-                            if third_word.isdigit() or third_word in ['6', '7', '9', '11', '13']:
-                                chord_unit += f" {third_word}"
-                                i += 1
-
-                chord_units.append(chord_unit)
-                self.logger.debug(f"    🎸 Chord unit: '{chord_unit}'")
-            else:
-                # Not a chord root, skip this word
-                self.logger.debug(f"    🎸 Non-chord word: '{word}'")
-
-            i += 1
+        # Extension words ("m", "maj", "7", ...) never start with a chord root,
+        # so each chord unit is counted by its root word
+        roots = self.italian_chord_roots
+        chord_unit_count = sum(1 for word in words if word.startswith(roots))
 
         # Calculate ratio of chord units to total words
-        chord_ratio = len(chord_units) / len(words)
-        self.logger.debug(f"    🎸 Chord units: {len(chord_units)}, Total words: {len(words)}, Ratio: {chord_ratio:.2f} (threshold: 0.5)")
+        chord_ratio = chord_unit_count / len(words)
+        if debug:
+            self.logger.debug(f"    🎸 Chord units: {chord_unit_count}, Total words: {len(words)}, Ratio: {chord_ratio:.2f} (threshold: 0.5)")
 
         # Lower threshold since we're now counting chord units properly
         return chord_ratio > 0.5
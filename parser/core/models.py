@@ -4,6 +4,7 @@ These models represent the core data structures used across all languages.
 """
 
 from dataclasses import dataclass
+from operator import attrgetter
 from typing import List, Optional, Dict, Any
 from enum import Enum
 
@@ -45,7 +46,7 @@ class VerseLine:
             return self.text
             
         # Sort chords by position
-        sorted_chords = sorted(self.chords, key=lambda c: c.position)
+        sorted_chords = sorted(self.chords, key=attrgetter('position'))
         
         result = ""
         lyric_pos = 0
@@ -12,6 +12,9 @@ from pathlib import Path
 
 from core.models import PDFTextElement
 
+# Image blocks are skipped below, so don't have MuPDF extract their pixel data
+_TEXT_DICT_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+
 
 class PDFExtractor:
     """
@@ -82,7 +85,7 @@ class PDFExtractor:
         elements = []
         
         # Get text with detailed formatting information
-        text_dict = page.get_text("dict")
+        text_dict = page.get_text("dict", flags=_TEXT_DICT_FLAGS)
         
         # Process each block
         for block in text_dict["blocks"]:
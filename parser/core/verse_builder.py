@@ -6,6 +6,7 @@ handling role assignment and line grouping logic.
 """
 
 import logging
+from operator import attrgetter
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 
@@ -309,7 +310,7 @@ class VerseBuilder:
                         chords.append(chord)
         
         # Sort chords by position
-        chords.sort(key=lambda c: c.position)
+        chords.sort(key=attrgetter('position'))
         
         return chords
     
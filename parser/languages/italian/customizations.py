@@ -6,6 +6,7 @@ Based on Spanish customizations structure
 
 import re
 import logging
+from operator import attrgetter
 from typing import List, Optional, Dict, Any
 from core.models import Verse, VerseLine, ParsedDocument, TextType, ClassifiedText, Chord
 from languages.base_language import LanguageCustomizations
@@ -553,7 +554,7 @@ class ItalianCustomizations(LanguageCustomizations):
         # Create new line with repositioned chords
         return VerseLine(
             text=line.text,
-            chords=sorted(new_chords, key=lambda x: x.position),
+            chords=sorted(new_chords, key=attrgetter('position')),
             original_line=line.original_line,
             line_type=getattr(line, 'line_type', None)
         )
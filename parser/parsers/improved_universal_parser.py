@@ -6,6 +6,7 @@ maintaining the universal architecture for multiple languages.
 """
 
 import logging
+from operator import attrgetter
 from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 
@@ -531,7 +532,7 @@ class ImprovedUniversalParser:
                 pixel_x=chord_pixel_x
             ))
         
-        return sorted(chords, key=lambda x: x.position)
+        return sorted(chords, key=attrgetter('position'))
     
     def export_chordpro(self, song: Song) -> str:
         """Export song to ChordPro format using the working parser's logic"""
@@ -602,7 +603,7 @@ class ImprovedUniversalParser:
         result = ""
         lyric_pos = 0
         
-        sorted_chords = sorted(chords, key=lambda x: x.position)
+        sorted_chords = sorted(chords, key=attrgetter('position'))
         
         for chord in sorted_chords:
             chord_pos = chord.position